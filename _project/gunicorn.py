@@ -0,0 +1,66 @@
+"""
+Gunicorn configuration for the _project project.
+
+Loaded by the Procfile with ``gunicorn _project.wsgi -c python:_project.gunicorn``.
+Every value can be overridden through the environment, so the same module
+serves development, benchmarks and production.
+
+For more information on this file, see
+https://docs.gunicorn.org/en/20.1.0/settings.html
+"""
+
+import gc
+import multiprocessing
+import os
+
+WORKER_CLASSES = {
+    "sync": "sync",
+    "gthread": "gthread",
+}
+
+
+def env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)) == "True"
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+worker_class = WORKER_CLASSES[os.getenv("GUNICORN_WORKER_CLASS", "gthread")]
+
+workers = env_int("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1)
+
+threads = env_int("GUNICORN_THREADS", 4 if worker_class == "gthread" else 1)
+
+# Imports Django once in the master so workers share its pages copy-on-write
+preload_app = env_bool("GUNICORN_PRELOAD", True)
+
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 1000)
+
+max_requests_jitter = env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+
+keepalive = env_int("GUNICORN_KEEPALIVE", 5)
+
+timeout = env_int("GUNICORN_TIMEOUT", 30)
+
+graceful_timeout = env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+
+def pre_fork(server, worker):
+    # Keeps the refcount/GC writes of preloaded objects from unsharing pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    if not server.cfg.preload_app:
+        return
+
+    from django.db import connections
+
+    connections.close_all()
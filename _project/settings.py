@@ -45,21 +45,33 @@ DJANGO_APPS = [
     "django.contrib.staticfiles",
 ]
 
+API_DOCS_ENABLED = os.getenv("API_DOCS_ENABLED", "True") == "True"
+
 THIRD_PARTY_APPS = [
     "rest_framework",
     "rest_framework.authtoken",
+]
+
+DOCS_APPS = [
     "drf_spectacular",
 ]
 
 MY_APPS = [
     "accounts",
+    "jobs",
     "products",
+    "utils",
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + MY_APPS
 
+if API_DOCS_ENABLED:
+    INSTALLED_APPS += DOCS_APPS
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "utils.middleware.LoadSheddingMiddleware",
+    "utils.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -107,6 +119,42 @@ DATABASES = {
     },
 }
 
+DATABASE_ROUTERS = ["products.routers.ProductShardRouter"]
+
+PRODUCT_SHARDS = [
+    alias for alias in os.getenv("PRODUCT_SHARDS", "").split(",") if alias
+]
+
+PRODUCT_PARTITIONING = os.getenv("PRODUCT_PARTITIONING", "")
+
+PRODUCT_HASH_PARTITIONS = int(os.getenv("PRODUCT_HASH_PARTITIONS", 8))
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/ref/settings/#caches
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "utils.cache.SQLiteCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", BASE_DIR / "cache.sqlite3"),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", 10_000)),
+            # Revocations, idempotency and stampede locks and throttle
+            # counters are only dropped when they expire.
+            "PINNED_PREFIXES": [
+                "auth:revoked:",
+                "auth:signed-revoked:",
+                "idempotency:",
+                "lock:",
+                "throttle_",
+            ],
+        },
+    },
+}
+
+# Gives each test run a temporary cache file instead of `CACHE_LOCATION`
+TEST_RUNNER = "utils.test_runner.TestRunner"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -151,12 +199,47 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "accounts.Account"
 
+AUTH_TOKEN_TTL = int(os.getenv("AUTH_TOKEN_TTL", 60 * 60 * 24))
+
+AUTH_TOKEN_CACHE_TIMEOUT = 300
+
+AUTH_REVOKED_LOCAL_MAX = 10_000
+
+SIGNED_TOKEN_TTL = int(os.getenv("SIGNED_TOKEN_TTL", 60 * 15))
+
+ORDERED_UUIDS = os.getenv("ORDERED_UUIDS", "True") == "True"
+
 REST_FRAMEWORK = {
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "utils.pagination.PageNumberPagination",
     "PAGE_SIZE": 2,
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Proxies in front of gunicorn (Heroku's router), so throttles key on
+    # the address they saw instead of a client-supplied X-Forwarded-For
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", 1)),
+    "DEFAULT_THROTTLE_RATES": {
+        "login": os.getenv("THROTTLE_LOGIN_RATE", "10/min"),
+        "account_creation": os.getenv("THROTTLE_ACCOUNT_CREATION_RATE", "10/min"),
+        "writes": os.getenv("THROTTLE_WRITES_RATE", "120/min"),
+    },
+    "DEFAULT_RENDERER_CLASSES": [
+        "rest_framework.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+        "utils.renderers.MessagePackRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "rest_framework.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+        "utils.parsers.MessagePackParser",
+    ],
 }
 
+# DRF reads the schema class while importing its views, so it is only
+# pointed at drf-spectacular when the docs are served
+if API_DOCS_ENABLED:
+    REST_FRAMEWORK.update(
+        DEFAULT_SCHEMA_CLASS="drf_spectacular.openapi.AutoSchema"
+    )
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Komercio API",
     "DESCRIPTION": "This API simulates an E-commerce base structure, with seller, buyer and admin accounts and products",
@@ -164,6 +247,92 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
 }
 
+LOAD_SHEDDING_PATHS = ["/api/login/", "/api/accounts/"]
+
+LOAD_SHEDDING_METHODS = ["POST"]
+
+# Counted per worker process, which never runs more requests at once than
+# it has threads (see _project/gunicorn.py). Shed requests may take every
+# thread but one, so a sync worker only sheds by queueing time.
+GUNICORN_THREADS = int(
+    os.getenv(
+        "GUNICORN_THREADS",
+        4 if os.getenv("GUNICORN_WORKER_CLASS", "gthread") == "gthread" else 1,
+    )
+)
+
+LOAD_SHEDDING_MAX_INFLIGHT = int(
+    os.getenv("LOAD_SHEDDING_MAX_INFLIGHT", GUNICORN_THREADS - 1)
+)
+
+LOAD_SHEDDING_MAX_QUEUE_MS = int(os.getenv("LOAD_SHEDDING_MAX_QUEUE_MS", 5000))
+
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", 60 * 60 * 24))
+
+IDEMPOTENCY_LOCK_TIMEOUT = 60
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 512))
+
+COMPRESSION_GZIP_LEVEL = 6
+
+COMPRESSION_BROTLI_QUALITY = 4
+
+COMPRESSION_ZSTD_LEVEL = 3
+
+ACCOUNT_BULK_MAX_IDS = 1000
+
+SELLER_PROFILE_CACHE_TIMEOUT = int(
+    os.getenv("SELLER_PROFILE_CACHE_TIMEOUT", 60 * 60)
+)
+
+JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", 1))
+
+JOBS_RETRY_BACKOFF = 2
+
+JOBS_LOCK_TIMEOUT = 300
+
+PAGINATION_MAX_PAGE_SIZE = int(os.getenv("PAGINATION_MAX_PAGE_SIZE", 100))
+
+PAGINATION_EXACT_COUNT_MAX = 10_000
+
+COUNT_CACHE_TIMEOUT = int(os.getenv("COUNT_CACHE_TIMEOUT", 600))
+
+CACHE_STALE_TTL = int(os.getenv("CACHE_STALE_TTL", 60))
+
+CACHE_LOCK_TIMEOUT = 10
+
+CACHE_LOCK_POLL_INTERVAL = 0.05
+
+PRODUCT_ARCHIVE_AFTER_DAYS = int(os.getenv("PRODUCT_ARCHIVE_AFTER_DAYS", 90))
+
+PRODUCT_CACHE_TIMEOUT = int(os.getenv("PRODUCT_CACHE_TIMEOUT", 300))
+
+PRODUCT_BATCH_MAX_IDS = 100
+
+PRODUCT_LIST_READ_MODEL = os.getenv("PRODUCT_LIST_READ_MODEL") == "True"
+
+PRODUCT_CHANGES_MAX_BATCH = 500
+
+PRODUCT_CHANGES_MAX_WAIT = 25
+
+PRODUCT_CHANGES_POLL_INTERVAL = 0.5
+
+PRODUCT_CHANGES_STREAM_SECONDS = 55
+
+# Changes younger than this many seconds are held back from the feed, so a
+# transaction that took an id and commits late is not skipped by a cursor
+# that already moved past it. Keep it above the longest write transaction.
+PRODUCT_CHANGES_SAFETY_LAG = float(os.getenv("PRODUCT_CHANGES_SAFETY_LAG", 5))
+
+# Long polling and streaming hold a worker for the whole wait, which blocks
+# a sync worker's only slot, so sync workers answer right away instead.
+PRODUCT_CHANGES_HOLD_REQUESTS = (
+    os.getenv("GUNICORN_WORKER_CLASS", "gthread") != "sync"
+)
+
+# Pre-generated with `python manage.py spectacular --file schema.yml`
+SCHEMA_FILE = BASE_DIR / "schema.yml"
+
 DATABASE_URL = os.environ.get("DATABASE_URL")
 
 if DATABASE_URL:
@@ -13,18 +13,26 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from utils.views import StaticSchemaView, lazy_view
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("accounts.urls")),
     path("api/", include("products.urls")),
-    path("schema/", SpectacularAPIView.as_view(), name="schema"),
-    path(
-        "api/docs/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
-        name="swagger-ui",
-    ),
+    path("schema/", StaticSchemaView.as_view(), name="schema"),
 ]
+
+if settings.API_DOCS_ENABLED:
+    urlpatterns += [
+        path(
+            "api/docs/",
+            lazy_view(
+                "drf_spectacular.views.SpectacularSwaggerView",
+                url_name="schema",
+            ),
+            name="swagger-ui",
+        ),
+    ]
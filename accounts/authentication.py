@@ -0,0 +1,241 @@
+import hashlib
+import time
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from accounts.models import Account
+
+_revoked = {}
+
+
+def _digest(key: str) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def token_cache_key(key: str) -> str:
+    return f"auth:token:{_digest(key)}"
+
+
+def revoked_cache_key(key: str) -> str:
+    return f"auth:revoked:{_digest(key)}"
+
+
+def is_locally_revoked(key: str) -> bool:
+    return _revoked.get(_digest(key), 0) > time.time()
+
+
+def revoke_tokens(keys):
+    """Rejects `keys` from now on: remembered in this process, which skips
+    the cache for them, and flagged in the shared cache for the others
+    until the tokens would have expired anyway.
+    """
+    expires_at = time.time() + settings.AUTH_TOKEN_TTL
+
+    if len(_revoked) > settings.AUTH_REVOKED_LOCAL_MAX:
+        now = time.time()
+
+        for digest, expiry in list(_revoked.items()):
+            if expiry <= now:
+                del _revoked[digest]
+
+    for key in keys:
+        _revoked[_digest(key)] = expires_at
+
+    cache.set_many(
+        {revoked_cache_key(key): True for key in keys},
+        timeout=settings.AUTH_TOKEN_TTL,
+    )
+    cache.delete_many([token_cache_key(key) for key in keys])
+
+
+def rotate_token(user) -> Token:
+    with transaction.atomic():
+        keys = list(
+            Token.objects.filter(user=user).values_list("key", flat=True)
+        )
+        Token.objects.filter(key__in=keys).delete()
+        token = Token.objects.create(user=user)
+
+    revoke_tokens(keys)
+
+    return token
+
+
+def forget_token_users(user_ids):
+    keys = Token.objects.filter(user_id__in=user_ids).values_list(
+        "key", flat=True
+    )
+
+    cache.delete_many([token_cache_key(key) for key in keys])
+
+
+def user_claims(user) -> dict:
+    return {
+        "id": str(user.pk),
+        "is_seller": user.is_seller,
+        "is_staff": user.is_staff,
+    }
+
+
+class ExpiringTokenAuthentication(TokenAuthentication):
+    """Token authentication with a lifetime of `AUTH_TOKEN_TTL` seconds.
+
+    Valid tokens are cached together with their user's claims, so most
+    requests authenticate with a single cache round trip and never query
+    `authtoken_token`; rotated tokens are revoked in that same lookup.
+    Saving an account drops its cached tokens.
+    """
+
+    def authenticate_credentials(self, key):
+        if is_locally_revoked(key):
+            raise AuthenticationFailed("Invalid token.")
+
+        entries = cache.get_many(
+            [token_cache_key(key), revoked_cache_key(key)]
+        )
+
+        if revoked_cache_key(key) in entries:
+            raise AuthenticationFailed("Invalid token.")
+
+        if token_cache_key(key) in entries:
+            claims, expires_at = entries[token_cache_key(key)]
+        else:
+            claims, expires_at = self.load_token(key)
+
+        if expires_at <= time.time():
+            raise AuthenticationFailed("Token has expired.")
+
+        return ClaimsUser(claims), key
+
+    def load_token(self, key) -> tuple:
+        try:
+            token = Token.objects.select_related("user").get(key=key)
+        except Token.DoesNotExist:
+            raise AuthenticationFailed("Invalid token.")
+
+        if not token.user.is_active:
+            raise AuthenticationFailed("User inactive or deleted.")
+
+        claims = user_claims(token.user)
+        expires_at = token.created.timestamp() + settings.AUTH_TOKEN_TTL
+        timeout = min(
+            expires_at - time.time(), settings.AUTH_TOKEN_CACHE_TIMEOUT
+        )
+
+        if timeout > 0:
+            cache.set(token_cache_key(key), (claims, expires_at), timeout)
+
+        return claims, expires_at
+
+
+SIGNED_TOKEN_SALT = "accounts.signed-token"
+
+
+def signed_revoked_cache_key(pk) -> str:
+    return f"auth:signed-revoked:{pk}"
+
+
+def remember_signed_watermark(user):
+    valid_after = user.tokens_valid_after
+
+    cache.add(
+        signed_revoked_cache_key(user.pk),
+        valid_after.timestamp() if valid_after else 0,
+        timeout=settings.SIGNED_TOKEN_TTL,
+    )
+
+
+def issue_signed_token(user) -> str:
+    remember_signed_watermark(user)
+
+    return signing.dumps(
+        {**user_claims(user), "iat": time.time()}, salt=SIGNED_TOKEN_SALT
+    )
+
+
+def revoke_signed_tokens(user_ids):
+    """Rejects the signed tokens issued so far to `user_ids`. The moment
+    is stored on the accounts and mirrored in the cache, which is what
+    requests check; an evicted entry is reloaded from the account.
+    """
+    now = timezone.now()
+
+    Account.objects.filter(pk__in=user_ids).update(tokens_valid_after=now)
+    cache.set_many(
+        {signed_revoked_cache_key(pk): now.timestamp() for pk in user_ids},
+        timeout=settings.SIGNED_TOKEN_TTL,
+    )
+
+
+class ClaimsUser:
+    """Authenticated user rebuilt from token claims, without loading the
+    `Account` row. Compares equal to the account it was issued for.
+    """
+
+    is_active = True
+    is_anonymous = False
+    is_authenticated = True
+
+    def __init__(self, claims: dict) -> None:
+        self.pk = self.id = uuid.UUID(claims["id"])
+        self.is_seller = claims["is_seller"]
+        self.is_staff = claims["is_staff"]
+
+    def __eq__(self, other):
+        return self.pk == getattr(other, "pk", None)
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __str__(self):
+        return str(self.pk)
+
+
+class SignedTokenAuthentication(TokenAuthentication):
+    """Stateless `Bearer` tokens signed with `SECRET_KEY` that expire after
+    `SIGNED_TOKEN_TTL` seconds. Tokens issued before the account's
+    `tokens_valid_after` are rejected through one cache lookup, falling
+    back to the account row when the cache lost the entry.
+    """
+
+    keyword = "Bearer"
+
+    def authenticate_credentials(self, key):
+        try:
+            claims = signing.loads(
+                key, salt=SIGNED_TOKEN_SALT, max_age=settings.SIGNED_TOKEN_TTL
+            )
+        except signing.SignatureExpired:
+            raise AuthenticationFailed("Token has expired.")
+        except signing.BadSignature:
+            raise AuthenticationFailed("Invalid token.")
+
+        revoked_at = cache.get(signed_revoked_cache_key(claims["id"]))
+
+        if revoked_at is None:
+            revoked_at = self.load_watermark(claims["id"])
+
+        if claims["iat"] <= revoked_at:
+            raise AuthenticationFailed("Invalid token.")
+
+        return ClaimsUser(claims), key
+
+    def load_watermark(self, pk) -> float:
+        try:
+            user = Account.objects.only("tokens_valid_after").get(pk=pk)
+        except Account.DoesNotExist:
+            raise AuthenticationFailed("User inactive or deleted.")
+
+        remember_signed_watermark(user)
+
+        valid_after = user.tokens_valid_after
+
+        return valid_after.timestamp() if valid_after else 0
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.cache import cache
+from utils.counters import CachedCounter
+
+from accounts.models import Account
+from accounts.serializers import SellerSerializer
+
+ACCOUNTS = CachedCounter("accounts")
+
+
+def seller_cache_key(pk) -> str:
+    return f"seller:{pk}"
+
+
+def get_seller_profiles(ids) -> dict:
+    ids = {str(pk) for pk in ids}
+    cached = cache.get_many([seller_cache_key(pk) for pk in ids])
+    profiles = {
+        pk: cached[seller_cache_key(pk)]
+        for pk in ids
+        if seller_cache_key(pk) in cached
+    }
+    misses = ids - profiles.keys()
+
+    if misses:
+        accounts = Account.objects.filter(id__in=misses)
+        fetched = {
+            data["id"]: dict(data)
+            for data in SellerSerializer(accounts, many=True).data
+        }
+        cache.set_many(
+            {seller_cache_key(pk): data for pk, data in fetched.items()},
+            timeout=settings.SELLER_PROFILE_CACHE_TIMEOUT,
+        )
+        profiles.update(fetched)
+
+    return profiles
+
+
+def invalidate_seller_profiles(ids):
+    cache.delete_many([seller_cache_key(pk) for pk in ids])
@@ -0,0 +1,24 @@
+# Generated by Django 4.1.2 on 2026-10-19 12:57
+
+from django.db import migrations, models
+import utils.uuids
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="account",
+            name="id",
+            field=models.UUIDField(
+                default=utils.uuids.new_uuid,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.2 on 2026-10-19 13:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_ordered_uuid_ids"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="account",
+            name="version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
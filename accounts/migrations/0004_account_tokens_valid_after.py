@@ -0,0 +1,18 @@
+# Generated by Django 4.1.2 on 2026-10-19 13:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_account_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="account",
+            name="tokens_valid_after",
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+    ]
@@ -1,3 +1,5 @@
+import uuid
+
 from rest_framework.permissions import BasePermission
 from rest_framework.views import Request, View
 
@@ -5,10 +7,18 @@ from accounts.models import Account
 
 
 class IsAccountOwner(BasePermission):
+    def has_permission(self, request: Request, view: View) -> bool:
+        try:
+            pk = uuid.UUID(str(view.kwargs["pk"]))
+        except ValueError:
+            return True
+
+        return request.user.pk == pk
+
     def has_object_permission(
         self,
         request: Request,
         view: View,
         obj: Account,
     ):
-        return request.user == obj
+        return request.user.pk == obj.pk
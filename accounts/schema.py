@@ -0,0 +1,19 @@
+from drf_spectacular.extensions import OpenApiViewExtension
+from drf_spectacular.utils import extend_schema
+
+
+class AccountBulkManagementViewExtension(OpenApiViewExtension):
+    """Names the bulk update apart from the per-account one at
+    `accounts/<pk>/management/`, which tokenizes to the same operationId.
+    Only imported when the API docs are enabled.
+    """
+
+    target_class = "accounts.views.AccountBulkManagementView"
+
+    def view_replacement(self):
+        class AccountBulkManagementView(self.target_class):
+            @extend_schema(operation_id="accounts_bulk_management_update")
+            def patch(self, request, *args, **kwargs):
+                return super().patch(request, *args, **kwargs)
+
+        return AccountBulkManagementView
@@ -1,9 +1,12 @@
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
 from rest_framework import serializers
+from utils.serializers import ChangedFieldsUpdateMixin
 
 from .models import Account
 
 
-class AccountSerializer(serializers.ModelSerializer):
+class AccountSerializer(ChangedFieldsUpdateMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
 
     class Meta:
@@ -30,6 +33,28 @@ class AccountSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         return Account.objects.create_user(**validated_data)
 
+    def update(self, instance, validated_data):
+        if "password" in validated_data:
+            validated_data["password"] = make_password(
+                validated_data["password"]
+            )
+
+        return super().update(instance, validated_data)
+
+
+class SellerSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Account
+
+        fields = [
+            "id",
+            "username",
+            "first_name",
+            "last_name",
+        ]
+
+        read_only_fields = fields
+
 
 class AccountDeactivateActivateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -53,3 +78,13 @@ class AccountDeactivateActivateSerializer(serializers.ModelSerializer):
             "date_joined",
             "is_superuser",
         ]
+
+
+class AccountBulkManagementSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        min_length=1,
+        max_length=settings.ACCOUNT_BULK_MAX_IDS,
+    )
+    is_active = serializers.BooleanField()
+    cascade_products = serializers.BooleanField(default=False)
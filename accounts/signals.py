@@ -0,0 +1,48 @@
+from django.db import transaction
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+from products.cache import ACTIVE_PRODUCTS, ALL_PRODUCTS, invalidate_products
+from products.models import Product, ProductListEntry
+from products.routers import shard_for
+
+from accounts.authentication import forget_token_users, revoke_signed_tokens
+from accounts.models import Account
+
+
+@receiver(post_save, sender=Account)
+def forget_saved_account_tokens(sender, instance, created, **kwargs):
+    if created:
+        return
+
+    transaction.on_commit(lambda: forget_token_users([instance.pk]))
+
+    if not instance.is_active:
+        revoke_signed_tokens([instance.pk])
+
+
+@receiver(pre_delete, sender=Account)
+def delete_seller_products(sender, instance, using, **kwargs):
+    """Deletes the seller's products on their shard, which the CASCADE
+    collector never sees as it only looks on the account's database, and
+    drops the listing rows and cached copies of every product.
+    """
+
+    shard = shard_for(instance.pk)
+    products = Product.objects.using(shard).filter(seller_id=instance.pk)
+    ids = list(products.values_list("id", flat=True))
+
+    if not ids:
+        return
+
+    if shard != using:
+        with transaction.atomic(using=shard):
+            products.delete()
+
+    ProductListEntry.objects.filter(seller_id=instance.pk).delete()
+
+    def forget():
+        invalidate_products(ids)
+        ACTIVE_PRODUCTS.reset()
+        ALL_PRODUCTS.reset()
+
+    transaction.on_commit(forget)
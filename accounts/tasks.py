@@ -0,0 +1,8 @@
+from jobs.registry import task
+
+from accounts.cache import invalidate_seller_profiles
+
+
+@task
+def invalidate_cached_sellers(ids):
+    invalidate_seller_profiles(ids)
@@ -1,6 +1,22 @@
+import time
+import uuid
+from io import StringIO
+from unittest import mock
+
+from accounts.authentication import (ExpiringTokenAuthentication,
+                                     token_cache_key)
+from accounts.cache import get_seller_profiles, seller_cache_key
 from accounts.models import Account
+from accounts.views import AccountView, LoginView
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from products.models import Product
 from rest_framework.authtoken.models import Token
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework.test import APITestCase
 
 
@@ -30,6 +46,9 @@ class AccountViewTests(APITestCase):
             "last_name": "correa",
         }
 
+    def setUp(self) -> None:
+        cache.clear()
+
     def test_can_create_seller_account(self):
         """
         Verifica a criação de conta de vendedor com dados corretos
@@ -423,3 +442,457 @@ class AccountViewTests(APITestCase):
         self.assertEqual(response.status_code, 200)
 
         self.assertEqual(response.data["count"], 1)
+
+    def test_login_is_throttled_per_ip(self):
+        """
+        Verifica se tentativas de login em excesso retornam 429
+        """
+        credentials = {"username": "gohan", "password": "errada"}
+
+        for _ in range(10):
+            response = self.client.post(self.LOGIN_URL, credentials)
+
+            self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(self.LOGIN_URL, credentials)
+
+        self.assertEqual(response.status_code, 429)
+
+        self.assertIn("Retry-After", response)
+
+    def test_login_throttle_ignores_forged_forwarded_for(self):
+        """
+        Verifica se trocar o início do `X-Forwarded-For` a cada tentativa
+        não escapa do limite de login do endereço visto pelo proxy
+        """
+        credentials = {"username": "gohan", "password": "errada"}
+
+        for number in range(11):
+            response = self.client.post(
+                self.LOGIN_URL,
+                credentials,
+                HTTP_X_FORWARDED_FOR=f"10.0.0.{number}, 203.0.113.7",
+            )
+
+        self.assertEqual(response.status_code, 429)
+
+        response = self.client.post(
+            self.LOGIN_URL,
+            credentials,
+            HTTP_X_FORWARDED_FOR="203.0.113.8",
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(LOAD_SHEDDING_MAX_QUEUE_MS=1000)
+    def test_login_is_shed_when_queued_too_long(self):
+        """
+        Verifica se o login é rejeitado antes da autenticação quando a
+        requisição esperou demais na fila
+        """
+        started = int((time.time() - 10) * 1000)
+
+        response = self.client.post(
+            self.LOGIN_URL,
+            {"username": "gohan", "password": "1234"},
+            HTTP_X_REQUEST_START=str(started),
+        )
+
+        self.assertEqual(response.status_code, 429)
+
+        self.assertFalse(Token.objects.exists())
+
+    @override_settings(LOAD_SHEDDING_MAX_INFLIGHT=1)
+    def test_login_is_shed_when_worker_is_busy(self):
+        """
+        Verifica se um login é rejeitado quando outro ainda ocupa o limite
+        de requisições em andamento do worker
+        """
+        credentials = {"username": "gohan", "password": "1234"}
+        responses = []
+        post = LoginView.post
+
+        def busy_post(view, request, *args, **kwargs):
+            if not responses:
+                responses.append(self.client.post(self.LOGIN_URL, credentials))
+
+            return post(view, request, *args, **kwargs)
+
+        with mock.patch.object(LoginView, "post", busy_post):
+            response = self.client.post(self.LOGIN_URL, credentials)
+
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(responses[0].status_code, 429)
+
+        self.assertEqual(responses[0]["Retry-After"], "1")
+
+    def test_retried_creation_with_idempotency_key(self):
+        """
+        Verifica se a criação de conta repetida com a mesma
+        `Idempotency-Key` não cria outra conta
+        """
+        first = self.client.post(
+            self.BASE_URL, self.seller_account_data, HTTP_IDEMPOTENCY_KEY="k1"
+        )
+
+        retry = self.client.post(
+            self.BASE_URL, self.seller_account_data, HTTP_IDEMPOTENCY_KEY="k1"
+        )
+
+        self.assertEqual(retry.status_code, 201)
+
+        self.assertEqual(retry.data, first.data)
+
+        self.assertEqual(Account.objects.count(), 2)
+
+    def test_idempotency_key_is_scoped_to_the_forwarded_client(self):
+        """
+        Verifica se clientes anônimos atrás do mesmo proxy não
+        compartilham a mesma `Idempotency-Key`
+        """
+        self.client.post(
+            self.BASE_URL,
+            self.seller_account_data,
+            HTTP_IDEMPOTENCY_KEY="k1",
+            HTTP_X_FORWARDED_FOR="203.0.113.7",
+        )
+
+        response = self.client.post(
+            self.BASE_URL,
+            self.common_account_data,
+            HTTP_IDEMPOTENCY_KEY="k1",
+            HTTP_X_FORWARDED_FOR="203.0.113.8",
+        )
+
+        self.assertEqual(response.status_code, 201)
+
+    def test_interrupted_creation_releases_idempotency_key(self):
+        """
+        Verifica se a chave em andamento expira rápido e é liberada
+        quando o worker é interrompido no meio da criação
+        """
+        with mock.patch(
+            "utils.mixins.cache.add", wraps=cache.add
+        ) as add, mock.patch.object(
+            AccountView, "perform_create", side_effect=SystemExit
+        ):
+            with self.assertRaises(SystemExit):
+                self.client.post(
+                    self.BASE_URL,
+                    self.seller_account_data,
+                    HTTP_IDEMPOTENCY_KEY="k1",
+                )
+
+        self.assertEqual(
+            add.call_args.args[2], settings.IDEMPOTENCY_LOCK_TIMEOUT
+        )
+
+        response = self.client.post(
+            self.BASE_URL, self.seller_account_data, HTTP_IDEMPOTENCY_KEY="k1"
+        )
+
+        self.assertEqual(response.status_code, 201)
+
+    def test_admin_can_bulk_deactivate_accounts(self):
+        """
+        Verifica se um admin consegue desativar várias contas de uma vez,
+        cascateando para os produtos
+        """
+        sellers = [
+            Account.objects.create_user(
+                username=f"seller{index}", password="abcd", is_seller=True
+            )
+            for index in range(2)
+        ]
+        product = Product.objects.create(
+            description="Mouse", price=10, quantity=1, seller=sellers[0]
+        )
+        missing = str(uuid.uuid4())
+
+        self.client.force_authenticate(self.admin_account)
+
+        response = self.client.patch(
+            f"{self.BASE_URL}management/",
+            {
+                "ids": [str(seller.id) for seller in sellers] + [missing],
+                "is_active": False,
+                "cascade_products": True,
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(response.data["updated"], 2)
+
+        self.assertEqual(response.data["products_updated"], 1)
+
+        self.assertEqual(response.data["missing"], [missing])
+
+        self.assertFalse(
+            Account.objects.filter(id__in=[s.id for s in sellers])
+            .filter(is_active=True)
+            .exists()
+        )
+
+        product.refresh_from_db()
+
+        self.assertFalse(product.is_active)
+
+    def test_bulk_activation_does_not_reactivate_products(self):
+        """
+        Verifica se reativar contas em lote não reativa produtos que o
+        vendedor tinha desativado
+        """
+        seller = Account.objects.create_user(
+            username="seller", password="abcd", is_seller=True
+        )
+        product = Product.objects.create(
+            description="Mouse",
+            price=10,
+            quantity=1,
+            seller=seller,
+            is_active=False,
+        )
+
+        self.client.force_authenticate(self.admin_account)
+
+        response = self.client.patch(
+            f"{self.BASE_URL}management/",
+            {
+                "ids": [str(seller.id)],
+                "is_active": True,
+                "cascade_products": True,
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.data["products_updated"], 0)
+
+        product.refresh_from_db()
+
+        self.assertFalse(product.is_active)
+
+    def test_not_admin_can_not_bulk_deactivate_accounts(self):
+        """
+        Verifica se um não admin não consegue usar a gestão em lote
+        """
+        seller = Account.objects.create_user(
+            username="seller", password="abcd", is_seller=True
+        )
+
+        self.client.force_authenticate(seller)
+
+        response = self.client.patch(
+            f"{self.BASE_URL}management/",
+            {"ids": [str(seller.id)], "is_active": False},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_bulk_cache_invalidation_runs_in_background(self):
+        """
+        Verifica se a invalidação em massa do cache fica para o worker de
+        jobs em vez de rodar na requisição
+        """
+        seller = Account.objects.create_user(
+            username="seller", password="abcd", is_seller=True
+        )
+        get_seller_profiles([seller.id])
+
+        self.client.force_authenticate(self.admin_account)
+
+        self.client.patch(
+            f"{self.BASE_URL}management/",
+            {"ids": [str(seller.id)], "is_active": False},
+            format="json",
+        )
+
+        self.assertIsNotNone(cache.get(seller_cache_key(seller.id)))
+
+        call_command("run_jobs", "--once", stdout=StringIO())
+
+        self.assertIsNone(cache.get(seller_cache_key(seller.id)))
+
+    def test_login_rotates_token(self):
+        """
+        Verifica se um novo login troca o token e revoga o anterior
+        """
+        self.client.post(self.BASE_URL, self.seller_account_data)
+        credentials = {
+            "username": self.seller_account_data["username"],
+            "password": self.seller_account_data["password"],
+        }
+
+        first = self.client.post(self.LOGIN_URL, credentials).data["token"]
+        second = self.client.post(self.LOGIN_URL, credentials).data["token"]
+
+        self.assertNotEqual(first, second)
+
+        authentication = ExpiringTokenAuthentication()
+
+        with self.assertRaises(AuthenticationFailed):
+            authentication.authenticate_credentials(first)
+
+        user, _ = authentication.authenticate_credentials(second)
+
+        self.assertEqual(
+            user,
+            Account.objects.get(username=self.seller_account_data["username"]),
+        )
+
+    def test_cached_token_skips_database(self):
+        """
+        Verifica se um token já validado autentica sem consultar o banco
+        """
+        token = Token.objects.create(user=self.admin_account)
+        authentication = ExpiringTokenAuthentication()
+
+        authentication.authenticate_credentials(token.key)
+
+        with self.assertNumQueries(0):
+            user, _ = authentication.authenticate_credentials(token.key)
+
+        self.assertEqual(user, self.admin_account)
+
+    def test_cached_token_keeps_only_claims(self):
+        """
+        Verifica se o cache do token guarda apenas as permissões da conta,
+        sem o hash da senha
+        """
+        token = Token.objects.create(user=self.admin_account)
+
+        ExpiringTokenAuthentication().authenticate_credentials(token.key)
+
+        claims, _ = cache.get(token_cache_key(token.key))
+
+        self.assertEqual(
+            claims,
+            {
+                "id": str(self.admin_account.id),
+                "is_seller": False,
+                "is_staff": True,
+            },
+        )
+
+    def test_saved_account_drops_cached_tokens(self):
+        """
+        Verifica se alterações feitas direto na conta, como pelo admin,
+        invalidam o token em cache
+        """
+        token = Token.objects.create(user=self.admin_account)
+        authentication = ExpiringTokenAuthentication()
+
+        authentication.authenticate_credentials(token.key)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.admin_account.is_active = False
+            self.admin_account.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            authentication.authenticate_credentials(token.key)
+
+    def test_password_change_revokes_signed_tokens(self):
+        """
+        Verifica se trocar a senha invalida os tokens assinados já
+        emitidos, mesmo depois de o cache perder a revogação
+        """
+        self.client.post(self.BASE_URL, self.seller_account_data)
+        account = Account.objects.get(username="ale")
+
+        login = self.client.post(
+            f"{self.LOGIN_URL}signed/",
+            {"username": "ale", "password": "abcd"},
+        )
+        authorization = f"Bearer {login.data['token']}"
+
+        response = self.client.patch(
+            f"{self.BASE_URL}{account.id}/",
+            {"password": "dcba"},
+            HTTP_AUTHORIZATION=authorization,
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        cache.clear()
+
+        response = self.client.patch(
+            f"{self.BASE_URL}{account.id}/",
+            {"first_name": "ale"},
+            HTTP_AUTHORIZATION=authorization,
+        )
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_expired_token_is_rejected(self):
+        """
+        Verifica se um token mais antigo que o TTL é recusado
+        """
+        token = Token.objects.create(user=self.admin_account)
+
+        with override_settings(AUTH_TOKEN_TTL=0):
+            response = self.client.patch(
+                f"{self.BASE_URL}{self.admin_account.id}/",
+                {"first_name": "son"},
+                HTTP_AUTHORIZATION=f"Token {token.key}",
+            )
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_account_patch_uses_minimum_queries(self):
+        """
+        Verifica se a checagem de dono da conta compara chaves primárias,
+        recusando outros usuários sem consultar o banco
+        """
+        account = Account.objects.create_user(
+            username="deb", password="1234abcd"
+        )
+        url = f"{self.BASE_URL}{account.id}/"
+
+        self.client.force_authenticate(self.admin_account)
+
+        with self.assertNumQueries(0):
+            response = self.client.patch(
+                url, {"first_name": "débora"}, format="json"
+            )
+
+        self.assertEqual(response.status_code, 403)
+
+        self.client.force_authenticate(account)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                url, {"first_name": "débora"}, format="json"
+            )
+
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(
+            [query["sql"].split()[0] for query in queries],
+            ["SELECT", "UPDATE", "SELECT"],
+        )
+
+    def test_password_update_is_hashed(self):
+        """
+        Verifica se a senha alterada por PATCH é gravada com hash e
+        permite o login
+        """
+        account = Account.objects.create_user(
+            username="deb", password="1234abcd"
+        )
+
+        self.client.force_authenticate(account)
+
+        response = self.client.patch(
+            f"{self.BASE_URL}{account.id}/",
+            {"password": "nova-senha"},
+            format="json",
+        )
+
+        self.assertEqual(response["ETag"], '"2"')
+
+        account.refresh_from_db()
+
+        self.assertTrue(account.check_password("nova-senha"))
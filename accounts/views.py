@@ -1,17 +1,47 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from jobs.registry import enqueue
+from products.models import Product, ProductChange
+from products.routers import shard_for
 from rest_framework import generics
-from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from utils.mixins import IdempotentCreateMixin, VersionedUpdateMixin
+from utils.throttling import (AccountCreationRateThrottle, LoginRateThrottle,
+                              WriteRateThrottle)
 
+from accounts.authentication import (ExpiringTokenAuthentication,
+                                     SignedTokenAuthentication,
+                                     forget_token_users, issue_signed_token,
+                                     revoke_signed_tokens, rotate_token)
+from accounts.cache import ACCOUNTS, invalidate_seller_profiles
 from accounts.models import Account
 from accounts.permissions import IsAccountOwner
-from accounts.serializers import (AccountDeactivateActivateSerializer,
+from accounts.serializers import (AccountBulkManagementSerializer,
+                                  AccountDeactivateActivateSerializer,
                                   AccountSerializer)
 
 
-class AccountView(generics.ListCreateAPIView):
+class AccountView(IdempotentCreateMixin, generics.ListCreateAPIView):
+    throttle_classes = [AccountCreationRateThrottle]
+    count_mode = "cached"
+
     queryset = Account.objects.all()
     serializer_class = AccountSerializer
 
+    def get_counter(self):
+        return ACCOUNTS
+
+    def perform_create(self, serializer):
+        serializer.save()
+        ACCOUNTS.incr()
+
 
 class AccountNewestView(generics.ListAPIView):
     serializer_class = AccountSerializer
@@ -24,22 +54,154 @@ class AccountNewestView(generics.ListAPIView):
         return queryset[:num]
 
 
-class AccountUpdateView(generics.UpdateAPIView):
-    authentication_classes = [TokenAuthentication]
+class LoginView(ObtainAuthToken):
+    authentication_classes = []
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+    throttle_classes = [LoginRateThrottle]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        token = rotate_token(serializer.validated_data["user"])
+
+        return Response({"token": token.key})
+
+
+class SignedLoginView(LoginView):
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        token = issue_signed_token(serializer.validated_data["user"])
+
+        return Response(
+            {"token": token, "expires_in": settings.SIGNED_TOKEN_TTL}
+        )
+
+
+class AccountUpdateView(VersionedUpdateMixin, generics.UpdateAPIView):
+    authentication_classes = [
+        ExpiringTokenAuthentication,
+        SignedTokenAuthentication,
+    ]
     permission_classes = [IsAccountOwner]
+    throttle_classes = [WriteRateThrottle]
 
     queryset = Account.objects.all()
     serializer_class = AccountSerializer
 
-    def partial_update(self, request, *args, **kwargs):
-        kwargs["partial"] = True
-        request.data["is_active"] = request.user.is_active
-        return self.update(request, *args, **kwargs)
+    def perform_update(self, serializer):
+        account = serializer.save()
+
+        if not serializer.changed_fields:
+            return
+
+        invalidate_seller_profiles([account.pk])
+        forget_token_users([account.pk])
+
+        if {"is_seller", "password"} & set(serializer.changed_fields):
+            revoke_signed_tokens([account.pk])
 
 
 class AccountDeactivateActivateView(generics.UpdateAPIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [
+        ExpiringTokenAuthentication,
+        SignedTokenAuthentication,
+    ]
     permission_classes = [IsAdminUser]
+    throttle_classes = [WriteRateThrottle]
 
     queryset = Account.objects.all()
     serializer_class = AccountDeactivateActivateSerializer
+
+    def perform_update(self, serializer):
+        account = serializer.save()
+        invalidate_seller_profiles([account.pk])
+        forget_token_users([account.pk])
+        revoke_signed_tokens([account.pk])
+
+
+class AccountBulkManagementView(generics.GenericAPIView):
+    authentication_classes = [
+        ExpiringTokenAuthentication,
+        SignedTokenAuthentication,
+    ]
+    permission_classes = [IsAdminUser]
+    throttle_classes = [WriteRateThrottle]
+
+    serializer_class = AccountBulkManagementSerializer
+
+    def patch(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        ids = set(serializer.validated_data["ids"])
+        is_active = serializer.validated_data["is_active"]
+        products = []
+
+        with transaction.atomic():
+            accounts = Account.objects.filter(id__in=ids)
+            found = set(accounts.values_list("id", flat=True))
+            updated = accounts.update(is_active=is_active)
+
+            # Re-activating leaves products alone: a seller may have
+            # deactivated some on purpose before the account was suspended
+            if serializer.validated_data["cascade_products"] and not is_active:
+                products = self.deactivate_products(found)
+
+            enqueue(
+                "accounts.tasks.invalidate_cached_sellers", ids=list(found)
+            )
+
+            if products:
+                enqueue(
+                    "products.tasks.invalidate_cached_products",
+                    ids=[product.id for product in products],
+                )
+
+        forget_token_users(found)
+        revoke_signed_tokens(found)
+
+        return Response(
+            {
+                "updated": updated,
+                "products_updated": len(products),
+                "missing": [str(pk) for pk in ids - found],
+            }
+        )
+
+    def deactivate_products(self, seller_ids: set) -> list:
+        shards = defaultdict(set)
+        products = []
+        now = timezone.now()
+
+        for seller_id in seller_ids:
+            shards[shard_for(seller_id)].add(seller_id)
+
+        for alias, ids in shards.items():
+            queryset = Product.objects.using(alias).filter(
+                seller_id__in=ids, is_active=True
+            )
+
+            with transaction.atomic(using=alias):
+                found = list(queryset.select_for_update())
+                queryset.filter(
+                    id__in=[product.id for product in found]
+                ).update(
+                    is_active=False,
+                    updated_at=now,
+                    version=F("version") + 1,
+                )
+
+            products.extend(found)
+
+        for product in products:
+            product.is_active = False
+            product.updated_at = now
+            product.version += 1
+
+        ProductChange.record(
+            products, ProductChange.UPDATED, activated=-len(products)
+        )
+
+        return products
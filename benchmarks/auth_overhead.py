@@ -0,0 +1,80 @@
+"""
+Measures per-request authentication overhead of token schemes.
+
+Creates a throwaway account and token in the configured database, then
+authenticates the same ``Authorization`` header repeatedly with DRF's
+TokenAuthentication and with the project's ExpiringTokenAuthentication,
+reporting the average time and database queries per request.
+
+Usage:
+
+    python benchmarks/auth_overhead.py --requests 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "_project.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from accounts.authentication import ExpiringTokenAuthentication  # noqa: E402
+from accounts.models import Account  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from rest_framework.authentication import TokenAuthentication  # noqa: E402
+from rest_framework.authtoken.models import Token  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+SCHEMES = {
+    "token": TokenAuthentication,
+    "expiring": ExpiringTokenAuthentication,
+}
+
+
+def measure(authentication, request, requests: int) -> tuple:
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+
+        for _ in range(requests):
+            authentication.authenticate(request)
+
+        elapsed = time.perf_counter() - started
+
+    return elapsed / requests * 1_000_000, len(queries) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    account = Account.objects.create_user(
+        username=f"bench-{uuid.uuid4().hex[:8]}", password="bench"
+    )
+
+    try:
+        token = Token.objects.create(user=account)
+        request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION=f"Token {token.key}"
+        )
+
+        print(f"{'scheme':<10}{'us/request':>12}{'queries/request':>17}")
+
+        for name, scheme in SCHEMES.items():
+            micros, queries = measure(scheme(), request, args.requests)
+
+            print(f"{name:<10}{micros:>12.1f}{queries:>17.2f}")
+    finally:
+        account.delete()
+
+
+if __name__ == "__main__":
+    main()
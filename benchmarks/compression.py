@@ -0,0 +1,126 @@
+"""
+Measures bytes-on-wire and CPU cost of compressing /api/products/ payloads.
+
+Renders product pages of increasing size with the serializers the views use
+(the list serializer and the detailed serializer with embedded sellers),
+then compresses each body with every available encoding.
+
+Usage:
+
+    python benchmarks/compression.py --page-sizes 2 20 100 500
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "_project.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from accounts.models import Account  # noqa: E402
+from accounts.serializers import SellerSerializer  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from products.models import Product  # noqa: E402
+from products.serializers import (DetailedProductSerializer,  # noqa: E402
+                                  GenericProductSerializer)
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from utils.compression import ENCODERS, compress  # noqa: E402
+
+
+def build_page(size: int, sellers: int) -> tuple:
+    accounts = [
+        Account(
+            id=uuid.uuid4(),
+            username=f"seller{index}",
+            first_name="Seller",
+            last_name=f"Number {index}",
+            is_seller=True,
+            date_joined=timezone.now(),
+        )
+        for index in range(sellers)
+    ]
+    products = [
+        Product(
+            id=uuid.uuid4(),
+            description=f"Product {index} with a reasonably long description",
+            price=Decimal("199.90") + index,
+            quantity=index,
+            seller_id=accounts[index % sellers].id,
+        )
+        for index in range(size)
+    ]
+    profiles = {
+        str(account.id): dict(SellerSerializer(account).data)
+        for account in accounts
+    }
+
+    generic = GenericProductSerializer(products, many=True).data
+    detailed = [
+        DetailedProductSerializer(
+            product, context={"seller_profiles": profiles}
+        ).data
+        for product in products
+    ]
+
+    return generic, detailed
+
+
+def measure(body: bytes, coding: str, repeat: int) -> tuple:
+    started = time.process_time()
+
+    for _ in range(repeat):
+        compressed = compress(coding, body)
+
+    elapsed = (time.process_time() - started) / repeat
+
+    return len(compressed), elapsed * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--page-sizes", type=int, nargs="+", default=[2, 20, 100, 500]
+    )
+    parser.add_argument("--sellers", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    renderer = JSONRenderer()
+    codings = sorted(ENCODERS)
+
+    print(f"{'payload':<10}{'page':>6}{'raw B':>10}", end="")
+    for coding in codings:
+        print(f"{coding + ' B':>10}{coding + ' us':>10}", end="")
+    print()
+
+    for size in args.page_sizes:
+        generic, detailed = build_page(size, args.sellers)
+
+        for name, results in (("list", generic), ("detailed", detailed)):
+            body = renderer.render(
+                {
+                    "count": size,
+                    "next": None,
+                    "previous": None,
+                    "results": results,
+                }
+            )
+            print(f"{name:<10}{size:>6}{len(body):>10}", end="")
+
+            for coding in codings:
+                compressed, micros = measure(body, coding, args.repeat)
+                print(f"{compressed:>10}{micros:>10.0f}", end="")
+
+            print()
+
+
+if __name__ == "__main__":
+    main()
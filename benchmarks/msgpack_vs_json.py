@@ -0,0 +1,93 @@
+"""
+Compares JSON and MessagePack for /api/products/ payloads.
+
+Renders the same product pages with DRF's JSONRenderer and the project's
+MessagePackRenderer, then decodes them the way a consumer would: JSON needs
+an extra pass turning decimal and UUID strings into native values, while
+MessagePack restores them through its extension types.
+
+Usage:
+
+    python benchmarks/msgpack_vs_json.py --page-sizes 20 100 500
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "_project.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+import msgpack  # noqa: E402
+from benchmarks.compression import build_page  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from utils.renderers import MessagePackRenderer, decode_ext  # noqa: E402
+
+
+def typed_json(body: bytes) -> dict:
+    data = json.loads(body)
+
+    for item in data["results"]:
+        item["id"] = uuid.UUID(item["id"])
+        item["price"] = Decimal(item["price"])
+        item["seller"]["id"] = uuid.UUID(item["seller"]["id"])
+
+    return data
+
+
+def typed_msgpack(body: bytes) -> dict:
+    return msgpack.unpackb(body, ext_hook=decode_ext)
+
+
+def timed(function, argument, repeat: int) -> tuple:
+    started = time.perf_counter()
+
+    for _ in range(repeat):
+        result = function(argument)
+
+    return result, (time.perf_counter() - started) / repeat * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--page-sizes", type=int, nargs="+", default=[20, 100, 500]
+    )
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    formats = (
+        ("json", JSONRenderer(), typed_json),
+        ("msgpack", MessagePackRenderer(), typed_msgpack),
+    )
+
+    print(
+        f"{'format':<9}{'page':>6}{'bytes':>10}{'encode us':>12}{'decode us':>12}"
+    )
+
+    for size in args.page_sizes:
+        _, detailed = build_page(size, sellers=5)
+        page = {"count": size, "next": None, "previous": None}
+        page["results"] = detailed
+
+        for name, renderer, decode in formats:
+            body, encode_us = timed(renderer.render, page, args.repeat)
+            _, decode_us = timed(decode, body, args.repeat)
+
+            print(
+                f"{name:<9}{size:>6}{len(body):>10}"
+                f"{encode_us:>12.0f}{decode_us:>12.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Compares product listing latency on a plain and on partitioned products
+tables.
+
+Creates temporary tables shaped like ``products_product`` (plain, listed
+by ``is_active`` and hashed by ``seller_id``), fills each with the same
+generated rows, most of them inactive as in a long-lived catalogue, and
+times the queries behind the product views: the first and a deep page of
+active products, the active count and one seller's active products.
+Reports the median latency in milliseconds. Run it against Postgres.
+
+Usage:
+
+    python benchmarks/partitioned_listing.py --rows 10000000
+"""
+
+import argparse
+import hashlib
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "_project.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from products.partitioning import PARTITION_BY  # noqa: E402
+
+LAYOUTS = ["plain", *PARTITION_BY]
+
+QUERIES = {
+    "first page": (
+        "SELECT * FROM {table} WHERE is_active ORDER BY id LIMIT %(size)s"
+    ),
+    "deep page": (
+        "SELECT * FROM {table} WHERE is_active ORDER BY id "
+        "LIMIT %(size)s OFFSET %(offset)s"
+    ),
+    "count": "SELECT count(*) FROM {table} WHERE is_active",
+    "seller": (
+        "SELECT * FROM {table} WHERE is_active AND seller_id = %(seller)s "
+        "ORDER BY id LIMIT %(size)s"
+    ),
+}
+
+
+def create_table(name: str, key, partitions: int):
+    partition_by = f"PARTITION BY {PARTITION_BY[key]}" if key else ""
+    primary_key = ", ".join(["id", key] if key else ["id"])
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {name}")
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {name} ("
+            " id uuid NOT NULL,"
+            " description text NOT NULL,"
+            " price numeric(10, 2) NOT NULL,"
+            " quantity integer NOT NULL,"
+            " is_active boolean NOT NULL,"
+            " updated_at timestamptz NOT NULL,"
+            " version integer NOT NULL,"
+            " seller_id uuid NOT NULL,"
+            f" PRIMARY KEY ({primary_key})"
+            f") {partition_by}"
+        )
+
+        if key == "is_active":
+            for suffix, value in (("active", "true"), ("inactive", "false")):
+                cursor.execute(
+                    f"CREATE TEMPORARY TABLE {name}_{suffix} PARTITION OF "
+                    f"{name} FOR VALUES IN ({value})"
+                )
+        elif key:
+            for remainder in range(partitions):
+                cursor.execute(
+                    f"CREATE TEMPORARY TABLE {name}_{remainder} PARTITION OF "
+                    f"{name} FOR VALUES WITH "
+                    f"(MODULUS {partitions}, REMAINDER {remainder})"
+                )
+
+
+def fill_table(name: str, rows: int, inactive: float, sellers: int):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {name} SELECT gen_random_uuid(), 'Mouse bonitinho',"
+            " 99.75, 13, random() >= %s, now() - random() * interval '1 year',"
+            " 1, md5((i %% %s)::text)::uuid"
+            " FROM generate_series(1, %s) AS i",
+            [inactive, sellers, rows],
+        )
+        cursor.execute(
+            f"CREATE INDEX ON {name} (id) WHERE is_active; "
+            f"CREATE INDEX ON {name} (updated_at) WHERE NOT is_active; "
+            f"CREATE INDEX ON {name} (seller_id)"
+        )
+        cursor.execute(f"VACUUM ANALYZE {name}")
+
+
+def measure(sql: str, params: dict, repeat: int) -> float:
+    timings = []
+
+    with connection.cursor() as cursor:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            cursor.execute(sql, params)
+            cursor.fetchall()
+            timings.append(time.perf_counter() - started)
+
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--inactive", type=float, default=0.8)
+    parser.add_argument("--sellers", type=int, default=10_000)
+    parser.add_argument("--partitions", type=int, default=8)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--page", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if connection.vendor != "postgresql":
+        sys.exit("This benchmark needs a Postgres database")
+
+    params = {
+        "size": args.page_size,
+        "offset": args.page_size * (args.page - 1),
+        "seller": str(uuid.UUID(hashlib.md5(b"1").hexdigest())),
+    }
+
+    print(f"{'layout':<11}" + "".join(f"{name:>12}" for name in QUERIES))
+
+    for layout in LAYOUTS:
+        name = f"bench_products_{layout}"
+        key = None if layout == "plain" else layout
+
+        create_table(name, key, args.partitions)
+        fill_table(name, args.rows, args.inactive, args.sellers)
+        timings = [
+            measure(sql.format(table=name), params, args.repeat)
+            for sql in QUERIES.values()
+        ]
+
+        print(f"{layout:<11}" + "".join(f"{ms:>12.2f}" for ms in timings))
+
+
+if __name__ == "__main__":
+    main()
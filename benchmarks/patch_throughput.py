@@ -0,0 +1,122 @@
+"""
+Compares PATCH throughput of DRF's stock update path and the project's
+changed-fields update path.
+
+Creates a throwaway seller and product in the configured database, then
+sends the same kind of PATCH (alternating quantities) straight to the
+views, bypassing middleware, throttling and URL routing. ``stock`` is
+ProductDetailView with DRF's default update, which saves every column;
+``changed`` writes only the changed column in one UPDATE and ``if-match``
+adds the optimistic concurrency check.
+
+Usage:
+
+    python benchmarks/patch_throughput.py --requests 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "_project.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from accounts.models import Account  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from products.models import Product  # noqa: E402
+from products.serializers import DetailedProductSerializer  # noqa: E402
+from products.views import ProductDetailView  # noqa: E402
+from rest_framework import serializers  # noqa: E402
+from rest_framework.mixins import UpdateModelMixin  # noqa: E402
+from rest_framework.test import (APIRequestFactory,  # noqa: E402
+                                 force_authenticate)
+
+
+class StockProductSerializer(DetailedProductSerializer):
+    def update(self, instance, validated_data):
+        self.changed_fields = list(validated_data)
+
+        return serializers.ModelSerializer.update(
+            self, instance, validated_data
+        )
+
+
+class StockProductView(ProductDetailView):
+    serializer_class = StockProductSerializer
+    throttle_classes = []
+
+    def update(self, request, *args, **kwargs):
+        return UpdateModelMixin.update(self, request, *args, **kwargs)
+
+
+def run(view, product, seller, requests: int, if_match: bool) -> tuple:
+    factory = APIRequestFactory()
+    product.refresh_from_db()
+    etag = f'"{product.version}"'
+
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+
+        for index in range(requests):
+            headers = {"HTTP_IF_MATCH": etag} if if_match else {}
+            request = factory.patch(
+                "/", {"quantity": index % 2 + 2}, format="json", **headers
+            )
+            force_authenticate(request, seller)
+            response = view(request, pk=product.pk)
+
+            assert response.status_code == 200, response.data
+
+            etag = response.get("ETag", etag)
+
+        elapsed = time.perf_counter() - started
+
+    return requests / elapsed, len(queries) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    seller = Account.objects.create_user(
+        username=f"bench-{uuid.uuid4().hex[:8]}",
+        password="bench",
+        is_seller=True,
+    )
+
+    try:
+        product = Product.objects.create(
+            description="Mouse bonitinho",
+            price=99.75,
+            quantity=1,
+            seller=seller,
+        )
+        paths = (
+            ("stock", StockProductView.as_view(), False),
+            ("changed", ProductDetailView.as_view(throttle_classes=[]), False),
+            ("if-match", ProductDetailView.as_view(throttle_classes=[]), True),
+        )
+
+        print(f"{'path':<10}{'req/s':>10}{'queries/req':>13}")
+
+        for name, view, if_match in paths:
+            throughput, queries = run(
+                view, product, seller, args.requests, if_match
+            )
+
+            print(f"{name:<10}{throughput:>10.0f}{queries:>13.2f}")
+    finally:
+        seller.delete()
+
+
+if __name__ == "__main__":
+    main()
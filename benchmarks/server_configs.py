@@ -0,0 +1,159 @@
+"""
+Compares memory per worker and throughput across gunicorn configurations.
+
+Starts ``gunicorn _project.wsgi -c python:_project.gunicorn`` once per
+configuration, measures the resident (RSS) and proportional (PSS, shared
+pages split between processes) memory of every worker, then hammers one
+endpoint with concurrent keep-alive-less clients.
+
+Linux only (reads /proc). Usage:
+
+    python benchmarks/server_configs.py --path /schema/ --requests 2000
+"""
+
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+CONFIGS = {
+    "sync": {"GUNICORN_WORKER_CLASS": "sync", "GUNICORN_PRELOAD": "False"},
+    "sync+preload": {
+        "GUNICORN_WORKER_CLASS": "sync",
+        "GUNICORN_PRELOAD": "True",
+    },
+    "gthread": {
+        "GUNICORN_WORKER_CLASS": "gthread",
+        "GUNICORN_PRELOAD": "False",
+    },
+    "gthread+preload": {
+        "GUNICORN_WORKER_CLASS": "gthread",
+        "GUNICORN_PRELOAD": "True",
+    },
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def children(pid: int) -> list:
+    path = Path(f"/proc/{pid}/task/{pid}/children")
+    return [int(child) for child in path.read_text().split()]
+
+
+def memory_kb(pid: int) -> tuple:
+    values = {}
+
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+        name, _, rest = line.partition(":")
+        if name in ("Rss", "Pss"):
+            values[name] = int(rest.split()[0])
+
+    return values["Rss"], values["Pss"]
+
+
+def wait_ready(url: str, deadline: float):
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+
+    raise RuntimeError(f"server did not answer {url}")
+
+
+def hit(url: str) -> bool:
+    try:
+        with urllib.request.urlopen(url, timeout=10) as response:
+            response.read()
+            return response.status < 500
+    except OSError:
+        return False
+
+
+def run(name: str, overrides: dict, args) -> dict:
+    port = free_port()
+    env = {
+        **os.environ,
+        **overrides,
+        "PORT": str(port),
+        "WEB_CONCURRENCY": str(args.workers),
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "_project.wsgi",
+            "-c",
+            "python:_project.gunicorn",
+        ],
+        cwd=BASE_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://localhost:{port}{args.path}"
+
+    try:
+        wait_ready(url, time.monotonic() + 30)
+
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            list(pool.map(hit, [url] * args.concurrency))
+
+            started = time.perf_counter()
+            ok = sum(pool.map(hit, [url] * args.requests))
+            elapsed = time.perf_counter() - started
+
+        workers = [memory_kb(pid) for pid in children(server.pid)]
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(30)
+
+    return {
+        "name": name,
+        "rss": sum(rss for rss, _ in workers) / len(workers) / 1024,
+        "pss": sum(pss for _, pss in workers) / len(workers) / 1024,
+        "rps": ok / elapsed,
+        "errors": args.requests - ok,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--path", default="/schema/")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--config", choices=CONFIGS, action="append")
+    args = parser.parse_args()
+
+    print(
+        f"{'config':<18}{'RSS/worker':>12}{'PSS/worker':>12}{'req/s':>10}{'errors':>8}"
+    )
+
+    for name in args.config or CONFIGS:
+        result = run(name, CONFIGS[name], args)
+        print(
+            f"{result['name']:<18}"
+            f"{result['rss']:>10.1f}MB"
+            f"{result['pss']:>10.1f}MB"
+            f"{result['rps']:>10.0f}"
+            f"{result['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
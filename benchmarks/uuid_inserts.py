@@ -0,0 +1,101 @@
+"""
+Compares insert throughput and primary-key index size for random (v4) and
+time-ordered (v7) UUIDs.
+
+Creates a temporary table shaped like ``products_product`` once per id
+generator, inserts rows in batches through the configured database and
+reports rows per second plus the size of the table and of its primary-key
+index. Run it against Postgres, where random keys split B-tree pages.
+
+Usage:
+
+    python benchmarks/uuid_inserts.py --rows 200000 --batch-size 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "_project.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection, transaction  # noqa: E402
+from utils.uuids import uuid7  # noqa: E402
+
+GENERATORS = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+
+def create_table(name: str):
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {name}")
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {name} ("
+            " id uuid PRIMARY KEY,"
+            " description text NOT NULL,"
+            " price numeric(10, 2) NOT NULL,"
+            " quantity integer NOT NULL"
+            ")"
+        )
+
+
+def insert_rows(name: str, generate, rows: int, batch_size: int) -> float:
+    started = time.perf_counter()
+
+    for offset in range(0, rows, batch_size):
+        batch = [
+            (str(generate()), "Mouse bonitinho", "99.75", 13)
+            for _ in range(min(batch_size, rows - offset))
+        ]
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {name} (id, description, price, quantity)"
+                " VALUES (%s, %s, %s, %s)",
+                batch,
+            )
+
+    return rows / (time.perf_counter() - started)
+
+
+def relation_sizes(name: str) -> tuple:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_relation_size(%s), pg_relation_size(%s)",
+            [name, f"{name}_pkey"],
+        )
+        return cursor.fetchone()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    if connection.vendor != "postgresql":
+        sys.exit("This benchmark needs a Postgres DATABASE_URL")
+
+    print(f"{'ids':<8}{'rows/s':>10}{'table MB':>10}{'index MB':>10}")
+
+    for label, generate in GENERATORS.items():
+        name = f"bench_{label}"
+
+        create_table(name)
+        throughput = insert_rows(name, generate, args.rows, args.batch_size)
+        table, index = relation_sizes(name)
+
+        print(
+            f"{label:<8}{throughput:>10.0f}"
+            f"{table / 2**20:>10.1f}{index / 2**20:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
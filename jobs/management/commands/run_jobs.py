@@ -0,0 +1,117 @@
+import os
+import signal
+import socket
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = "Runs queued background jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Jobs run in parallel threads",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Jobs claimed per poll, defaults to the concurrency",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.JOBS_POLL_INTERVAL,
+            help="Seconds to sleep when the queue is empty",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is ready instead of polling",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Print the queue depth per status and exit",
+        )
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            return self.print_queue_stats()
+
+        self.running = True
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+        concurrency = options["concurrency"]
+        batch_size = options["batch_size"] or concurrency
+        stats = Counter()
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while self.running:
+                Job.requeue_stale(settings.JOBS_LOCK_TIMEOUT)
+                jobs = Job.claim(worker, batch_size)
+
+                if not jobs:
+                    if options["once"]:
+                        break
+
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                if concurrency == 1:
+                    results = [self.run_job(job) for job in jobs]
+                else:
+                    results = pool.map(self.run_pooled_job, jobs)
+
+                for job, (succeeded, elapsed) in zip(jobs, results):
+                    stats["processed"] += 1
+                    stats["seconds"] += elapsed
+
+                    if succeeded:
+                        stats["succeeded"] += 1
+                    elif job.status == Job.FAILED:
+                        stats["failed"] += 1
+                    else:
+                        stats["retried"] += 1
+
+        self.print_run_stats(stats, time.monotonic() - started)
+
+    def stop(self, signum, frame):
+        self.running = False
+
+    def run_job(self, job) -> tuple:
+        started = time.monotonic()
+
+        return job.run(), time.monotonic() - started
+
+    def run_pooled_job(self, job) -> tuple:
+        try:
+            return self.run_job(job)
+        finally:
+            close_old_connections()
+
+    def print_queue_stats(self):
+        for status, _ in Job.STATUS_CHOICES:
+            count = Job.objects.filter(status=status).count()
+            self.stdout.write(f"{status}: {count}")
+
+    def print_run_stats(self, stats, elapsed):
+        average = stats["seconds"] * 1000 / max(stats["processed"], 1)
+
+        self.stdout.write(
+            f"Processed {stats['processed']} jobs in {elapsed:.1f}s: "
+            f"{stats['succeeded']} succeeded, {stats['retried']} retried, "
+            f"{stats['failed']} failed, {average:.1f}ms on average"
+        )
@@ -0,0 +1,149 @@
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models, transaction
+from django.utils import timezone
+
+
+class JobQuerySet(models.QuerySet):
+    def ready(self, now):
+        return self.filter(status=Job.QUEUED, run_at__lte=now)
+
+    def stale(self, before):
+        return self.filter(status=Job.RUNNING, locked_at__lt=before)
+
+
+class Job(models.Model):
+    QUEUED = "queued"
+    RUNNING = "running"
+    FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (FAILED, "Failed"),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    task = models.CharField(max_length=200)
+    payload = models.JSONField(encoder=DjangoJSONEncoder, default=dict)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=QUEUED
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["run_at"],
+                name="job_queued_run_at_idx",
+                condition=models.Q(status="queued"),
+            ),
+        ]
+
+    @classmethod
+    def claim(cls, worker: str, limit: int) -> list:
+        """Marks up to `limit` ready jobs as running for `worker`.
+
+        Postgres hands out rows with `FOR UPDATE SKIP LOCKED`, so concurrent
+        workers never wait on each other. Backends without it claim each
+        candidate with a conditional UPDATE and skip the ones another
+        worker took first.
+        """
+        now = timezone.now()
+        ready = cls.objects.ready(now).order_by("run_at")
+        claimed = {
+            "status": cls.RUNNING,
+            "locked_by": worker,
+            "locked_at": now,
+        }
+
+        features = connections[cls.objects.db].features
+
+        if features.has_select_for_update_skip_locked:
+            with transaction.atomic():
+                jobs = list(ready.select_for_update(skip_locked=True)[:limit])
+                cls.objects.filter(id__in=[job.id for job in jobs]).update(
+                    attempts=models.F("attempts") + 1, **claimed
+                )
+        else:
+            jobs = [
+                job
+                for job in ready[:limit]
+                if cls.objects.filter(id=job.id, status=cls.QUEUED).update(
+                    attempts=models.F("attempts") + 1, **claimed
+                )
+            ]
+
+        for job in jobs:
+            job.attempts += 1
+
+            for field, value in claimed.items():
+                setattr(job, field, value)
+
+        return jobs
+
+    @classmethod
+    def requeue_stale(cls, timeout: float) -> int:
+        """Releases jobs whose worker stopped holding them for `timeout`
+        seconds. The lost run already counted as an attempt when the job
+        was claimed, so jobs out of attempts are marked failed instead of
+        queued again. Returns how many jobs were queued again.
+        """
+        before = timezone.now() - timedelta(seconds=timeout)
+        stale = cls.objects.stale(before)
+        released = {"locked_by": "", "locked_at": None}
+
+        stale.filter(attempts__gte=models.F("max_attempts")).update(
+            status=cls.FAILED,
+            last_error="The worker stopped while running the job",
+            **released,
+        )
+
+        return stale.update(status=cls.QUEUED, **released)
+
+    def run(self) -> bool:
+        from .registry import TASKS
+
+        try:
+            TASKS[self.task](**self.payload)
+        except Exception:
+            self.fail(traceback.format_exc())
+            return False
+
+        Job.objects.filter(id=self.id).delete()
+
+        return True
+
+    def fail(self, error: str):
+        self.last_error = error
+        self.locked_by = ""
+        self.locked_at = None
+
+        if self.attempts >= self.max_attempts:
+            self.status = self.FAILED
+        else:
+            self.status = self.QUEUED
+            self.run_at = timezone.now() + timedelta(
+                seconds=settings.JOBS_RETRY_BACKOFF * 2 ** (self.attempts - 1)
+            )
+
+        self.save(
+            update_fields=[
+                "status",
+                "run_at",
+                "locked_by",
+                "locked_at",
+                "last_error",
+            ]
+        )
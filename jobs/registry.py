@@ -0,0 +1,20 @@
+from .models import Job
+
+TASKS = {}
+
+
+def task(function):
+    TASKS[f"{function.__module__}.{function.__name__}"] = function
+
+    return function
+
+
+def enqueue(name: str, **payload) -> Job:
+    """Queues `name` to run in a worker. Call it inside the transaction of
+    the write that needs the work, so the job only becomes visible to
+    workers once that write commits.
+    """
+    if name not in TASKS:
+        raise KeyError(f"Unknown task {name!r}")
+
+    return Job.objects.create(task=name, payload=payload)
@@ -0,0 +1,122 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from jobs.models import Job
+from jobs.registry import enqueue, task
+
+calls = []
+
+
+@task
+def collect(value):
+    calls.append(value)
+
+
+@task
+def explode():
+    raise RuntimeError("boom")
+
+
+class JobTests(TestCase):
+    def setUp(self) -> None:
+        calls.clear()
+
+    def run_jobs(self) -> str:
+        out = StringIO()
+        call_command("run_jobs", "--once", stdout=out)
+
+        return out.getvalue()
+
+    def test_unknown_task_can_not_be_enqueued(self):
+        """
+        Verifica se uma task não registrada não pode ser enfileirada
+        """
+        with self.assertRaises(KeyError):
+            enqueue("jobs.tests.tests_units.missing")
+
+    def test_worker_runs_and_removes_jobs(self):
+        """
+        Verifica se o worker executa os jobs e os remove da fila
+        """
+        enqueue("jobs.tests.tests_units.collect", value=1)
+        enqueue("jobs.tests.tests_units.collect", value=2)
+
+        output = self.run_jobs()
+
+        self.assertEqual(calls, [1, 2])
+
+        self.assertFalse(Job.objects.exists())
+
+        self.assertIn("2 succeeded", output)
+
+    def test_claimed_job_is_not_claimed_again(self):
+        """
+        Verifica se um job já reservado não é reservado por outro worker
+        """
+        enqueue("jobs.tests.tests_units.collect", value=1)
+
+        self.assertEqual(len(Job.claim("a", 10)), 1)
+
+        self.assertEqual(Job.claim("b", 10), [])
+
+    def test_failed_job_is_retried_with_backoff(self):
+        """
+        Verifica se um job com erro é reagendado com backoff e falha de vez
+        ao esgotar as tentativas
+        """
+        job = enqueue("jobs.tests.tests_units.explode")
+
+        self.assertIn("1 retried", self.run_jobs())
+
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, Job.QUEUED)
+
+        self.assertGreater(job.run_at, timezone.now())
+
+        self.assertIn("RuntimeError", job.last_error)
+
+        Job.objects.update(
+            run_at=timezone.now(), attempts=job.max_attempts - 1
+        )
+
+        self.assertIn("1 failed", self.run_jobs())
+
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, Job.FAILED)
+
+    def test_stale_running_jobs_are_requeued(self):
+        """
+        Verifica se jobs presos com um worker que caiu voltam para a fila
+        """
+        enqueue("jobs.tests.tests_units.collect", value=1)
+        Job.claim("crashed", 1)
+        Job.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+
+        self.run_jobs()
+
+        self.assertEqual(calls, [1])
+
+    def test_stale_jobs_out_of_attempts_fail(self):
+        """
+        Verifica se um job preso que já esgotou as tentativas é marcado
+        como falho em vez de voltar para a fila
+        """
+        job = enqueue("jobs.tests.tests_units.collect", value=1)
+        Job.objects.update(attempts=job.max_attempts - 1)
+        Job.claim("crashed", 1)
+        Job.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+
+        self.run_jobs()
+
+        job.refresh_from_db()
+
+        self.assertEqual(calls, [])
+
+        self.assertEqual(job.status, Job.FAILED)
+
+        self.assertEqual(job.locked_by, "")
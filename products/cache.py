@@ -0,0 +1,88 @@
+from accounts.cache import get_seller_profiles
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from utils.counters import CachedCounter
+from utils.stampede import get_or_compute, unwrap, wrap
+
+ACTIVE_PRODUCTS = CachedCounter("products:active")
+ALL_PRODUCTS = CachedCounter("products:all")
+ARCHIVED_PRODUCTS = CachedCounter("products:archived")
+
+
+def product_cache_key(pk) -> str:
+    return f"product:{pk}"
+
+
+def with_sellers(products: dict) -> dict:
+    sellers = get_seller_profiles(
+        {data["seller"] for data in products.values()}
+    )
+
+    return {
+        pk: {**data, "seller": sellers[data["seller"]]}
+        for pk, data in products.items()
+        if data["seller"] in sellers
+    }
+
+
+def get_cached_products(ids) -> dict:
+    cached = cache.get_many([product_cache_key(pk) for pk in ids])
+    products = {
+        str(pk): unwrap(cached.get(product_cache_key(pk))) for pk in ids
+    }
+
+    return with_sellers(
+        {pk: data for pk, data in products.items() if data is not None}
+    )
+
+
+def without_seller(data: dict) -> dict:
+    return {**data, "seller": data["seller"]["id"]}
+
+
+def get_product(pk, load) -> dict:
+    data = get_or_compute(
+        product_cache_key(pk),
+        lambda: without_seller(load()),
+        settings.PRODUCT_CACHE_TIMEOUT,
+    )
+
+    return with_sellers({str(pk): data}).get(str(pk)) or load()
+
+
+def cache_products(representations: dict):
+    cache.set_many(
+        {
+            product_cache_key(pk): wrap(
+                without_seller(data), settings.PRODUCT_CACHE_TIMEOUT
+            )
+            for pk, data in representations.items()
+        },
+        timeout=settings.PRODUCT_CACHE_TIMEOUT + settings.CACHE_STALE_TTL,
+    )
+
+
+def invalidate_products(ids):
+    cache.delete_many([product_cache_key(pk) for pk in ids])
+
+
+def count_product_changes(products, kind: str, activated: int = 0):
+    """Adjusts the cached counts once the recorded changes commit, so a
+    rolled back write never skews them. `activated` is the net number of
+    products an update turned active.
+    """
+
+    def adjust():
+        if kind == "created":
+            ALL_PRODUCTS.incr(len(products))
+            ACTIVE_PRODUCTS.incr(
+                sum(product.is_active for product in products)
+            )
+        elif kind == "archived":
+            ALL_PRODUCTS.decr(len(products))
+            ARCHIVED_PRODUCTS.incr(len(products))
+        elif activated:
+            ACTIVE_PRODUCTS.incr(activated)
+
+    transaction.on_commit(adjust)
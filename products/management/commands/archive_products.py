@@ -0,0 +1,51 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from products.models import ArchivedProduct
+from products.routers import product_shards
+
+
+class Command(BaseCommand):
+    help = "Moves long-inactive products to the archive table in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.PRODUCT_ARCHIVE_AFTER_DAYS,
+            help="Archive products inactive for at least this many days",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.1,
+            help="Seconds to sleep between batches",
+        )
+        parser.add_argument("--max-batches", type=int, default=None)
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options["days"])
+        total = batches = 0
+
+        for alias in product_shards():
+            while (
+                options["max_batches"] is None
+                or batches < options["max_batches"]
+            ):
+                archived = ArchivedProduct.archive_batch(
+                    before, options["batch_size"], using=alias
+                )
+
+                if not archived:
+                    break
+
+                total += archived
+                batches += 1
+
+                time.sleep(options["pause"])
+
+        self.stdout.write(f"Archived {total} products in {batches} batches")
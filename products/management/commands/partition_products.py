@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from products.partitioning import (PARTITION_BY, partition_products,
+                                   unpartition_products)
+
+
+class Command(BaseCommand):
+    help = "Partitions the products table on Postgres, or merges it back"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--key",
+            choices=list(PARTITION_BY),
+            default=settings.PRODUCT_PARTITIONING or "is_active",
+        )
+        parser.add_argument(
+            "--partitions",
+            type=int,
+            default=settings.PRODUCT_HASH_PARTITIONS,
+            help="Number of hash partitions when partitioning by seller_id",
+        )
+        parser.add_argument(
+            "--undo",
+            action="store_true",
+            help="Copy the rows back into a single table",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+
+        if connection.vendor != "postgresql":
+            raise CommandError("Partitioning needs a Postgres database")
+
+        with transaction.atomic(using=options["database"]):
+            if options["undo"]:
+                changed = unpartition_products(connection)
+            else:
+                changed = partition_products(
+                    connection, options["key"], options["partitions"]
+                )
+
+        if not changed:
+            self.stdout.write("Products table already in the requested layout")
+        elif options["undo"]:
+            self.stdout.write("Merged products back into a single table")
+        else:
+            self.stdout.write(f"Partitioned products by {options['key']}")
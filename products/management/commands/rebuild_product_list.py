@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from products.models import ProductListEntry
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the denormalized product list from the products table"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = ProductListEntry.rebuild(options["batch_size"])
+
+        self.stdout.write(f"Rebuilt {total} product list entries")
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from products.models import ProductPricePoint
+
+
+class Command(BaseCommand):
+    help = "Appends the price history points of recent product changes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.PRODUCT_CHANGES_MAX_BATCH,
+            help="Outbox changes read per transaction",
+        )
+
+    def handle(self, *args, **options):
+        recorded = ProductPricePoint.record_pending(options["batch_size"])
+
+        self.stdout.write(f"Recorded {recorded} price points")
@@ -0,0 +1,40 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from products.models import ProductDailyPrice, ProductPricePoint
+
+
+class Command(BaseCommand):
+    help = (
+        "Records pending price points, then computes daily min/max/avg "
+        "price rollups from the price history"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--day",
+            type=date.fromisoformat,
+            default=None,
+            help="Last day to roll up (YYYY-MM-DD), defaults to today",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=2,
+            help="Number of days to roll up, ending at --day",
+        )
+
+    def handle(self, *args, **options):
+        last = options["day"] or timezone.localdate()
+        total = 0
+
+        ProductPricePoint.record_pending(settings.PRODUCT_CHANGES_MAX_BATCH)
+
+        for offset in reversed(range(options["days"])):
+            total += ProductDailyPrice.rollup(last - timedelta(days=offset))
+
+        self.stdout.write(
+            f"Rolled up {total} product days over {options['days']} days"
+        )
@@ -0,0 +1,36 @@
+# Generated by Django 4.1.2 on 2026-10-19 12:53
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0003_productchange"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductListEntry",
+            fields=[
+                ("product_id", models.UUIDField(primary_key=True, serialize=False)),
+                ("seller_id", models.UUIDField(db_index=True)),
+                ("is_active", models.BooleanField()),
+                (
+                    "row",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="productlistentry",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["product_id"],
+                name="product_list_active_idx",
+            ),
+        ),
+    ]
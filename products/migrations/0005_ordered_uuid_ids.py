@@ -0,0 +1,24 @@
+# Generated by Django 4.1.2 on 2026-10-19 12:57
+
+from django.db import migrations, models
+import utils.uuids
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0004_productlistentry"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="product",
+            name="id",
+            field=models.UUIDField(
+                default=utils.uuids.new_uuid,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
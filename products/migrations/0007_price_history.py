@@ -0,0 +1,56 @@
+# Generated by Django 4.1.2 on 2026-10-19 13:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0006_product_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductDailyPrice",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("product_id", models.UUIDField()),
+                ("day", models.DateField()),
+                ("min_price", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("max_price", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("avg_price", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("samples", models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ProductPricePoint",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("product_id", models.UUIDField()),
+                ("price", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("quantity", models.PositiveIntegerField()),
+                ("recorded_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="productpricepoint",
+            index=models.Index(
+                fields=["product_id", "recorded_at"],
+                name="price_point_product_time_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="productdailyprice",
+            constraint=models.UniqueConstraint(
+                fields=("product_id", "day"), name="daily_price_unique"
+            ),
+        ),
+    ]
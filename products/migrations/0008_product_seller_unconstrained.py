@@ -0,0 +1,26 @@
+# Generated by Django 4.1.2 on 2026-10-19 13:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("products", "0007_price_history"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="product",
+            name="seller",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="products",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
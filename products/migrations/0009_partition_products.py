@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.db import migrations
+
+from products.partitioning import partition_products, unpartition_products
+
+
+def partition(apps, schema_editor):
+    connection = schema_editor.connection
+
+    if connection.vendor == "postgresql" and settings.PRODUCT_PARTITIONING:
+        partition_products(
+            connection, settings.PRODUCT_PARTITIONING, settings.PRODUCT_HASH_PARTITIONS
+        )
+
+
+def unpartition(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        unpartition_products(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0008_product_seller_unconstrained"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition, hints={"model_name": "product"}),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.1.2 on 2026-10-19 13:55
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def start_after_recorded_changes(apps, schema_editor):
+    # Points for the changes made so far were written with the requests
+    using = schema_editor.connection.alias
+    ProductChange = apps.get_model("products", "ProductChange")
+    ProductChangeCursor = apps.get_model("products", "ProductChangeCursor")
+    last = ProductChange.objects.using(using).aggregate(last=models.Max("id"))
+
+    ProductChangeCursor.objects.using(using).create(
+        name="price_points", position=last["last"] or 0
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0009_partition_products"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductChangeCursor",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=50, primary_key=True, serialize=False),
+                ),
+                ("position", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="productdailyprice",
+            name="close_price",
+            field=models.DecimalField(decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name="productpricepoint",
+            name="change_id",
+            field=models.BigIntegerField(null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="productpricepoint",
+            name="recorded_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(start_after_recorded_changes, migrations.RunPython.noop),
+    ]
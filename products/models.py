@@ -1,15 +1,491 @@
-import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
 
-from django.db import models
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, models, transaction
+from django.utils import timezone
+from jobs.registry import enqueue
+from utils.uuids import new_uuid
+
+from .cache import count_product_changes, invalidate_products
+from .routers import scatter
+
+
+class ProductQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(is_active=True)
+
+    def archivable(self, before):
+        return self.filter(is_active=False, updated_at__lt=before)
+
+    def create(self, **kwargs):
+        product = self.model(**kwargs)
+        product.save(force_insert=True, using=self._db)
+
+        return product
 
 
 class Product(models.Model):
-    id = models.UUIDField(default=uuid.uuid4, primary_key=True, editable=False)
+    id = models.UUIDField(default=new_uuid, primary_key=True, editable=False)
     description = models.TextField()
     price = models.DecimalField(max_digits=10, decimal_places=2)
     quantity = models.PositiveIntegerField()
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1)
 
     seller = models.ForeignKey(
-        "accounts.Account", on_delete=models.CASCADE, related_name="products"
+        "accounts.Account",
+        on_delete=models.CASCADE,
+        related_name="products",
+        db_constraint=False,
     )
+
+    objects = ProductQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"],
+                name="product_active_idx",
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=["updated_at"],
+                name="product_inactive_updated_idx",
+                condition=models.Q(is_active=False),
+            ),
+        ]
+
+    def list_row(self) -> dict:
+        return {
+            "description": self.description,
+            "price": str(self.price),
+            "quantity": self.quantity,
+            "is_active": self.is_active,
+            "seller_id": str(self.seller_id),
+        }
+
+    def partition_lookup(self) -> dict:
+        key = settings.PRODUCT_PARTITIONING
+
+        return {key: getattr(self, key)} if key else {}
+
+    def change_payload(self) -> dict:
+        return {
+            "id": str(self.id),
+            "description": self.description,
+            "price": str(self.price),
+            "quantity": self.quantity,
+            "is_active": self.is_active,
+            "seller_id": str(self.seller_id),
+        }
+
+
+class ArchivedProduct(models.Model):
+    id = models.UUIDField(primary_key=True, editable=False)
+    description = models.TextField()
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    quantity = models.PositiveIntegerField()
+    is_active = models.BooleanField(default=False)
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    seller = models.ForeignKey(
+        "accounts.Account",
+        on_delete=models.CASCADE,
+        related_name="archived_products",
+    )
+
+    @classmethod
+    def archive_batch(
+        cls, before, batch_size: int, using: str = DEFAULT_DB_ALIAS
+    ) -> int:
+        with transaction.atomic(), transaction.atomic(using=using):
+            products = list(
+                Product.objects.using(using)
+                .archivable(before)
+                .select_for_update(skip_locked=True)
+                .order_by("updated_at")[:batch_size]
+            )
+
+            cls.objects.bulk_create(
+                cls(
+                    id=product.id,
+                    description=product.description,
+                    price=product.price,
+                    quantity=product.quantity,
+                    is_active=product.is_active,
+                    updated_at=product.updated_at,
+                    seller_id=product.seller_id,
+                )
+                for product in products
+            )
+
+            Product.objects.using(using).filter(
+                id__in=[product.id for product in products], is_active=False
+            ).delete()
+
+            ProductChange.record(products, ProductChange.ARCHIVED)
+
+        invalidate_products([product.id for product in products])
+
+        return len(products)
+
+
+class ProductChange(models.Model):
+    CREATED = "created"
+    UPDATED = "updated"
+    ARCHIVED = "archived"
+
+    KIND_CHOICES = [
+        (CREATED, "Created"),
+        (UPDATED, "Updated"),
+        (ARCHIVED, "Archived"),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    product_id = models.UUIDField(db_index=True)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @classmethod
+    def record(cls, products, kind: str, activated: int = 0) -> list:
+        changes = cls.objects.bulk_create(
+            cls(
+                product_id=product.id,
+                kind=kind,
+                payload=product.change_payload(),
+            )
+            for product in products
+        )
+
+        if settings.PRODUCT_LIST_READ_MODEL and len(products) > 1:
+            enqueue(
+                "products.tasks.refresh_list_entries",
+                ids=[product.id for product in products],
+            )
+        elif settings.PRODUCT_LIST_READ_MODEL:
+            ProductListEntry.apply(products, kind)
+
+        count_product_changes(products, kind, activated)
+
+        return changes
+
+    @classmethod
+    def settled(cls, after: int, limit: int) -> list:
+        """Changes after the `after` cursor, in id order.
+
+        Ids are taken when a transaction inserts, not when it commits, so a
+        lower id can become visible after a higher one was served. The
+        batch therefore stops at the first change younger than
+        `PRODUCT_CHANGES_SAFETY_LAG`; a transaction still open after that
+        lag can be skipped.
+        """
+
+        cutoff = timezone.now() - timedelta(
+            seconds=settings.PRODUCT_CHANGES_SAFETY_LAG
+        )
+        changes = list(cls.objects.filter(id__gt=after).order_by("id")[:limit])
+
+        for index, change in enumerate(changes):
+            if change.created_at > cutoff:
+                return changes[:index]
+
+        return changes
+
+
+class ProductChangeCursor(models.Model):
+    """Position of a consumer that follows the change outbox inside the
+    project, such as the price history.
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    position = models.BigIntegerField(default=0)
+
+
+class ProductListEntry(models.Model):
+    """Pre-rendered row of the product listing, kept in sync with the
+    outbox so the list endpoint reads a single table in primary key order.
+    """
+
+    product_id = models.UUIDField(primary_key=True)
+    seller_id = models.UUIDField(db_index=True)
+    is_active = models.BooleanField()
+    row = models.JSONField(encoder=DjangoJSONEncoder)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["product_id"],
+                name="product_list_active_idx",
+                condition=models.Q(is_active=True),
+            ),
+        ]
+
+    @classmethod
+    def from_product(cls, product):
+        return cls(
+            product_id=product.id,
+            seller_id=product.seller_id,
+            is_active=product.is_active,
+            row=product.list_row(),
+        )
+
+    @classmethod
+    def apply(cls, products, kind: str):
+        if kind == ProductChange.ARCHIVED:
+            cls.objects.filter(
+                product_id__in=[product.id for product in products]
+            ).delete()
+            return
+
+        cls.objects.bulk_create(
+            [cls.from_product(product) for product in products],
+            update_conflicts=True,
+            unique_fields=["product_id"],
+            update_fields=["seller_id", "is_active", "row"],
+        )
+
+    @classmethod
+    def rebuild(cls, batch_size: int) -> int:
+        total = 0
+
+        with transaction.atomic():
+            cls.objects.all().delete()
+
+            products = scatter(Product.objects.order_by("id")).iterator(
+                chunk_size=batch_size
+            )
+            batch = []
+
+            for product in products:
+                batch.append(cls.from_product(product))
+
+                if len(batch) == batch_size:
+                    cls.objects.bulk_create(batch)
+                    total += len(batch)
+                    batch = []
+
+            cls.objects.bulk_create(batch)
+            total += len(batch)
+
+        return total
+
+
+class ProductPricePoint(models.Model):
+    CURSOR = "price_points"
+
+    id = models.BigAutoField(primary_key=True)
+    product_id = models.UUIDField()
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    quantity = models.PositiveIntegerField()
+    recorded_at = models.DateTimeField(default=timezone.now)
+    change_id = models.BigIntegerField(null=True, unique=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["product_id", "recorded_at"],
+                name="price_point_product_time_idx",
+            ),
+        ]
+
+    @classmethod
+    def latest(cls, queryset) -> dict:
+        last_ids = (
+            queryset.values("product_id")
+            .annotate(last_id=models.Max("id"))
+            .values("last_id")
+        )
+
+        return {
+            point.product_id: point
+            for point in cls.objects.filter(id__in=last_ids)
+        }
+
+    @classmethod
+    def record_pending(cls, batch_size: int) -> int:
+        """Appends the price points of the settled outbox changes, one
+        batch of changes per transaction, from the position kept in
+        `ProductChangeCursor`. Returns how many points were written.
+        """
+        total = 0
+
+        while True:
+            with transaction.atomic():
+                cursor, _ = (
+                    ProductChangeCursor.objects.select_for_update()
+                    .get_or_create(name=cls.CURSOR)
+                )
+                changes = ProductChange.settled(cursor.position, batch_size)
+
+                if not changes:
+                    return total
+
+                points = cls.objects.bulk_create(cls.from_changes(changes))
+                cursor.position = changes[-1].id
+                cursor.save(update_fields=["position"])
+
+            total += len(points)
+
+    @classmethod
+    def from_changes(cls, changes) -> list:
+        """Points for the changes that moved a product's price or quantity
+        away from its last recorded point.
+        """
+        changes = [
+            change
+            for change in changes
+            if change.kind != ProductChange.ARCHIVED
+        ]
+        last = {
+            product_id: (point.price, point.quantity)
+            for product_id, point in cls.latest(
+                cls.objects.filter(
+                    product_id__in={change.product_id for change in changes}
+                )
+            ).items()
+        }
+        points = []
+
+        for change in changes:
+            values = (
+                Decimal(change.payload["price"]),
+                change.payload["quantity"],
+            )
+
+            if last.get(change.product_id) == values:
+                continue
+
+            last[change.product_id] = values
+            points.append(
+                cls(
+                    product_id=change.product_id,
+                    price=values[0],
+                    quantity=values[1],
+                    recorded_at=change.created_at,
+                    change_id=change.id,
+                )
+            )
+
+        return points
+
+
+class ProductDailyPrice(models.Model):
+    product_id = models.UUIDField()
+    day = models.DateField()
+    min_price = models.DecimalField(max_digits=10, decimal_places=2)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2)
+    avg_price = models.DecimalField(max_digits=10, decimal_places=2)
+    close_price = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True
+    )
+    samples = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product_id", "day"], name="daily_price_unique"
+            ),
+        ]
+
+    @classmethod
+    def opening_prices(cls, day, start) -> dict:
+        """Prices products entered `day` with: the previous day's closing
+        prices, or the last recorded points when that day was never rolled
+        up.
+        """
+        closing = dict(
+            cls.objects.filter(
+                day=day - timedelta(days=1), close_price__isnull=False
+            ).values_list("product_id", "close_price")
+        )
+
+        if closing:
+            return closing
+
+        return {
+            product_id: point.price
+            for product_id, point in ProductPricePoint.latest(
+                ProductPricePoint.objects.filter(recorded_at__lt=start)
+            ).items()
+        }
+
+    @classmethod
+    def rollup(cls, day) -> int:
+        """Upserts each product's min, max and average price on `day`.
+
+        The price a product entered the day with counts as a sample next to
+        the day's points, and products whose price did not change get a
+        row from it alone until they are archived. Roll days up in order,
+        as each day opens with the previous day's closing prices.
+        """
+        start = timezone.make_aware(datetime.combine(day, datetime.min.time()))
+        end = timezone.make_aware(
+            datetime.combine(day + timedelta(days=1), datetime.min.time())
+        )
+        opening = cls.opening_prices(day, start)
+        archived = set(
+            ArchivedProduct.objects.filter(
+                id__in=list(opening), archived_at__lt=start
+            ).values_list("id", flat=True)
+        )
+        points = ProductPricePoint.objects.filter(
+            recorded_at__gte=start, recorded_at__lt=end
+        )
+        stats = {
+            row["product_id"]: row
+            for row in points.values("product_id").annotate(
+                min_price=models.Min("price"),
+                max_price=models.Max("price"),
+                total=models.Sum("price"),
+                samples=models.Count("id"),
+            )
+        }
+        closing = ProductPricePoint.latest(points)
+        rollups = []
+
+        for product_id in (opening.keys() - archived) | stats.keys():
+            prices = [opening[product_id]] if product_id in opening else []
+            total = sum(prices)
+            count = len(prices)
+            samples = 0
+
+            if product_id in stats:
+                row = stats[product_id]
+                prices += [row["min_price"], row["max_price"]]
+                total += row["total"]
+                count += row["samples"]
+                samples = row["samples"]
+
+            close = closing.get(product_id)
+
+            rollups.append(
+                cls(
+                    product_id=product_id,
+                    day=day,
+                    min_price=min(prices),
+                    max_price=max(prices),
+                    avg_price=(total / count).quantize(Decimal("0.01")),
+                    close_price=close.price if close else prices[0],
+                    samples=samples,
+                )
+            )
+
+        rollups = cls.objects.bulk_create(
+            rollups,
+            update_conflicts=True,
+            unique_fields=["product_id", "day"],
+            update_fields=[
+                "min_price",
+                "max_price",
+                "avg_price",
+                "close_price",
+                "samples",
+            ],
+        )
+
+        return len(rollups)
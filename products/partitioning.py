@@ -0,0 +1,114 @@
+TABLE = "products_product"
+
+PARTITION_BY = {
+    "is_active": "LIST (is_active)",
+    "seller_id": "HASH (seller_id)",
+}
+
+
+def is_partitioned(cursor) -> bool:
+    cursor.execute(
+        "SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [TABLE]
+    )
+    row = cursor.fetchone()
+
+    return row is not None and row[0] == "p"
+
+
+def partitions_for(key: str, count: int) -> list:
+    if key == "is_active":
+        return [
+            f"CREATE TABLE {TABLE}_active PARTITION OF {TABLE} "
+            "FOR VALUES IN (true)",
+            f"CREATE TABLE {TABLE}_inactive PARTITION OF {TABLE} "
+            "FOR VALUES IN (false)",
+        ]
+
+    return [
+        f"CREATE TABLE {TABLE}_{remainder} PARTITION OF {TABLE} "
+        f"FOR VALUES WITH (MODULUS {count}, REMAINDER {remainder})"
+        for remainder in range(count)
+    ]
+
+
+def rebuild_table(cursor, primary_key: list, partition_by="", partitions=()):
+    """Recreates the products table with the same columns, checks and
+    indexes, optionally partitioned, and copies the rows over. Runs inside
+    the caller's transaction, holding an exclusive lock on the table.
+    """
+
+    cursor.execute(
+        "SELECT indexname, indexdef FROM pg_indexes "
+        "WHERE schemaname = current_schema() AND tablename = %s "
+        "AND indexname NOT IN (SELECT conname FROM pg_constraint "
+        "WHERE conrelid = to_regclass(%s))",
+        [TABLE, TABLE],
+    )
+    indexes = cursor.fetchall()
+    cursor.execute(
+        "SELECT conname FROM pg_constraint "
+        "WHERE conrelid = to_regclass(%s) AND contype = 'p'",
+        [TABLE],
+    )
+    (pkey,) = cursor.fetchone()
+
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX "{name}"')
+
+    cursor.execute(f'ALTER TABLE {TABLE} DROP CONSTRAINT "{pkey}"')
+    cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {TABLE}_old")
+    cursor.execute(
+        f"CREATE TABLE {TABLE} (LIKE {TABLE}_old "
+        f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS) {partition_by}"
+    )
+
+    for statement in partitions:
+        cursor.execute(statement)
+
+    cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {TABLE}_old")
+    cursor.execute(f"DROP TABLE {TABLE}_old")
+    cursor.execute(
+        f'ALTER TABLE {TABLE} ADD CONSTRAINT "{pkey}" '
+        f"PRIMARY KEY ({', '.join(primary_key)})"
+    )
+
+    for _, definition in indexes:
+        cursor.execute(definition)
+
+    cursor.execute(f"ANALYZE {TABLE}")
+
+
+def partition_products(connection, key: str, count: int = 8) -> bool:
+    """Partitions `products_product` on Postgres by list of `is_active` or
+    by hash of `seller_id` into `count` partitions.
+
+    The partition key joins `id` in the primary key, as Postgres requires,
+    so `id` stays unique only through its generator. Returns False when
+    the table is already partitioned.
+    """
+
+    if key not in PARTITION_BY:
+        raise ValueError(f"Products can not be partitioned by {key!r}")
+
+    with connection.cursor() as cursor:
+        if is_partitioned(cursor):
+            return False
+
+        rebuild_table(
+            cursor,
+            ["id", key],
+            f"PARTITION BY {PARTITION_BY[key]}",
+            partitions_for(key, count),
+        )
+
+    return True
+
+
+def unpartition_products(connection) -> bool:
+    with connection.cursor() as cursor:
+        if not is_partitioned(cursor):
+            return False
+
+        rebuild_table(cursor, ["id"])
+
+    return True
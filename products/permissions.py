@@ -25,5 +25,5 @@ class IsProductOwnerOrReadOnly(BasePermission):
         return bool(
             request.method in SAFE_METHODS
             or request.user.is_authenticated
-            and request.user == obj.seller
+            and request.user.pk == obj.seller_id
         )
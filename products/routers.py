@@ -0,0 +1,140 @@
+import heapq
+import zlib
+from itertools import chain, islice
+from operator import attrgetter
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PRODUCT_MODEL = "products.product"
+
+
+def product_shards() -> list:
+    return settings.PRODUCT_SHARDS or [DEFAULT_DB_ALIAS]
+
+
+def shard_for(seller_id) -> str:
+    shards = product_shards()
+
+    return shards[zlib.crc32(str(seller_id).encode()) % len(shards)]
+
+
+def scatter(queryset):
+    shards = product_shards()
+
+    if len(shards) == 1:
+        return queryset.using(shards[0])
+
+    return ScatterGather(queryset, shards)
+
+
+class ScatterGather:
+    """Read-only view of one product queryset run on every shard.
+
+    Rows are merged in the queryset's ordering, so slicing `[start:stop]`
+    reads up to `stop` rows from each shard and paginating deep into a
+    cross-seller listing costs more the more shards there are.
+    """
+
+    def __init__(self, queryset, shards) -> None:
+        fields = [str(field) for field in queryset.query.order_by]
+
+        self.model = queryset.model
+        self.querysets = [queryset.using(alias) for alias in shards]
+        self.ordered = bool(fields)
+        self.reverse = self.ordered and fields[0].startswith("-")
+        self.key = (
+            attrgetter(*(field.lstrip("-") for field in fields))
+            if fields
+            else None
+        )
+
+    def merge(self, iterables):
+        if not self.ordered:
+            return chain.from_iterable(iterables)
+
+        return heapq.merge(*iterables, key=self.key, reverse=self.reverse)
+
+    def __iter__(self):
+        return self.merge(self.querysets)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index : index + 1][0]
+
+        rows = self.merge(
+            [queryset[: index.stop] for queryset in self.querysets]
+        )
+
+        return list(islice(rows, index.start, index.stop))
+
+    def iterator(self, chunk_size: int):
+        return self.merge(
+            [
+                queryset.iterator(chunk_size=chunk_size)
+                for queryset in self.querysets
+            ]
+        )
+
+    def count(self) -> int:
+        return sum(queryset.count() for queryset in self.querysets)
+
+    def get(self, **kwargs):
+        for queryset in self.querysets:
+            try:
+                return queryset.get(**kwargs)
+            except self.model.DoesNotExist:
+                pass
+
+        raise self.model.DoesNotExist(
+            f"{self.model._meta.object_name} matching query does not exist."
+        )
+
+
+class ProductShardRouter:
+    """Places each product on one of the `PRODUCT_SHARDS` database aliases
+    by a hash of its seller, and keeps every other model on `default`.
+
+    Querysets without an instance to route by are read from `default`;
+    views spread those over the shards with `scatter`.
+    """
+
+    def db_for_read(self, model, **hints):
+        return self.db_for_instance(model, hints.get("instance"))
+
+    def db_for_write(self, model, **hints):
+        return self.db_for_instance(model, hints.get("instance"))
+
+    def db_for_instance(self, model, instance):
+        if not settings.PRODUCT_SHARDS or instance is None:
+            return None
+
+        label = instance._meta.label_lower
+
+        if model._meta.label_lower != PRODUCT_MODEL:
+            return DEFAULT_DB_ALIAS if label == PRODUCT_MODEL else None
+
+        if label == PRODUCT_MODEL:
+            return shard_for(instance.seller_id)
+
+        if label == settings.AUTH_USER_MODEL.lower():
+            return shard_for(instance.pk)
+
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        labels = {obj1._meta.label_lower, obj2._meta.label_lower}
+
+        if settings.PRODUCT_SHARDS and PRODUCT_MODEL in labels:
+            return True
+
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == DEFAULT_DB_ALIAS or db not in settings.PRODUCT_SHARDS:
+            return None
+
+        return f"{app_label}.{model_name}" == PRODUCT_MODEL
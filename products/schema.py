@@ -0,0 +1,15 @@
+from accounts.serializers import SellerSerializer
+from drf_spectacular.extensions import OpenApiSerializerFieldExtension
+
+
+class SellerProfileFieldExtension(OpenApiSerializerFieldExtension):
+    """Documents the embedded seller as the profile it renders. Only
+    imported when the API docs are enabled.
+    """
+
+    target_class = "products.serializers.SellerProfileField"
+
+    def map_serializer_field(self, auto_schema, direction):
+        component = auto_schema.resolve_serializer(SellerSerializer, direction)
+
+        return component.ref
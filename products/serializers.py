@@ -1,11 +1,46 @@
-from accounts.serializers import AccountSerializer
+from accounts.cache import get_seller_profiles
+from accounts.serializers import SellerSerializer
+from django.db import models
 from rest_framework import serializers
+from utils.serializers import ChangedFieldsUpdateMixin
 
-from .models import Product
+from .models import (ArchivedProduct, Product, ProductChange,
+                     ProductDailyPrice, ProductPricePoint)
 
 
-class DetailedProductSerializer(serializers.ModelSerializer):
-    seller = AccountSerializer(read_only=True)
+class SellerProfileField(serializers.Field):
+    serializer_class = SellerSerializer
+
+    def __init__(self, **kwargs):
+        kwargs["source"] = "seller_id"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, seller_id):
+        profiles = self.context.setdefault("seller_profiles", {})
+        seller_id = str(seller_id)
+
+        if seller_id not in profiles:
+            profiles.update(get_seller_profiles([seller_id]))
+
+        return profiles.get(seller_id)
+
+
+class SellerEmbeddingListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.Manager) else data)
+
+        self.context.setdefault("seller_profiles", {}).update(
+            get_seller_profiles({item.seller_id for item in items})
+        )
+
+        return super().to_representation(items)
+
+
+class DetailedProductSerializer(
+    ChangedFieldsUpdateMixin, serializers.ModelSerializer
+):
+    seller = SellerProfileField()
 
     class Meta:
         model = Product
@@ -16,13 +51,18 @@ class DetailedProductSerializer(serializers.ModelSerializer):
             "price",
             "quantity",
             "is_active",
+            "version",
             "seller",
         ]
 
-        read_only_fields = ["is_active"]
+        read_only_fields = ["is_active", "version"]
+
+        list_serializer_class = SellerEmbeddingListSerializer
 
 
 class GenericProductSerializer(serializers.ModelSerializer):
+    seller_id = serializers.UUIDField(read_only=True)
+
     class Meta:
         model = Product
 
@@ -41,3 +81,64 @@ class GenericProductSerializer(serializers.ModelSerializer):
             "is_active",
             "seller_id",
         ]
+
+
+class ArchivedProductSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedProduct
+
+        fields = [
+            "id",
+            "description",
+            "price",
+            "quantity",
+            "is_active",
+            "seller_id",
+            "updated_at",
+            "archived_at",
+        ]
+
+        read_only_fields = fields
+
+
+class ProductChangeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProductChange
+
+        fields = [
+            "id",
+            "product_id",
+            "kind",
+            "payload",
+            "created_at",
+        ]
+
+        read_only_fields = fields
+
+
+class ProductPricePointSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProductPricePoint
+
+        fields = [
+            "price",
+            "quantity",
+            "recorded_at",
+        ]
+
+        read_only_fields = fields
+
+
+class ProductDailyPriceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProductDailyPrice
+
+        fields = [
+            "day",
+            "min_price",
+            "max_price",
+            "avg_price",
+            "samples",
+        ]
+
+        read_only_fields = fields
@@ -0,0 +1,20 @@
+from jobs.registry import task
+
+from .cache import invalidate_products
+from .models import Product, ProductChange, ProductListEntry
+from .routers import scatter
+
+
+@task
+def invalidate_cached_products(ids):
+    invalidate_products(ids)
+
+
+@task
+def refresh_list_entries(ids):
+    products = list(scatter(Product.objects.filter(id__in=ids)))
+
+    ProductListEntry.objects.filter(product_id__in=ids).exclude(
+        product_id__in=[product.id for product in products]
+    ).delete()
+    ProductListEntry.apply(products, ProductChange.UPDATED)
@@ -1,5 +1,26 @@
-from products.models import Product
-from rest_framework.test import APITestCase
+import threading
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+import msgpack
+from accounts.models import Account
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection, connections, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from products.models import (Product, ProductChange, ProductListEntry,
+                             ProductPricePoint)
+from products.routers import shard_for
+from products.views import ProductDetailView
+from rest_framework.test import (APIClient, APITestCase,
+                                 APITransactionTestCase)
+from utils.renderers import decode_ext, encode_ext
 
 
 class ProductViewTests(APITestCase):
@@ -32,6 +53,9 @@ class ProductViewTests(APITestCase):
             "quantity": 13,
         }
 
+    def setUp(self) -> None:
+        cache.clear()
+
     def test_seller_can_create_product(self):
         """
         Verifica se um vendedor consegue criar um produto corretamente
@@ -77,7 +101,13 @@ class ProductViewTests(APITestCase):
 
         product = self.client.post(self.BASE_URL, self.product_data)
 
-        self.assertEqual(product.data["seller"], seller.data)
+        self.assertEqual(
+            product.data["seller"],
+            {
+                field: seller.data[field]
+                for field in ["id", "username", "first_name", "last_name"]
+            },
+        )
 
     def test_common_account_can_not_create_product(self):
         """
@@ -323,3 +353,1069 @@ class ProductViewTests(APITestCase):
             str(products.data["results"][0]["seller_id"]),
             seller.data["id"],
         )
+
+    def test_retried_creation_with_idempotency_key(self):
+        """
+        Verifica se um POST repetido com a mesma `Idempotency-Key`
+        retorna a resposta original sem criar outro produto
+        """
+        self.client.post(self.ACCOUNT_URL, self.seller_account_data)
+
+        seller_login = self.client.post(
+            self.LOGIN_URL,
+            {
+                "username": self.seller_account_data["username"],
+                "password": self.seller_account_data["password"],
+            },
+        )
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {seller_login.data['token']}",
+        )
+
+        first = self.client.post(
+            self.BASE_URL, self.product_data, HTTP_IDEMPOTENCY_KEY="abc"
+        )
+
+        retry = self.client.post(
+            self.BASE_URL, self.product_data, HTTP_IDEMPOTENCY_KEY="abc"
+        )
+
+        self.assertEqual(retry.status_code, 201)
+
+        self.assertEqual(retry.data, first.data)
+
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+
+        self.assertEqual(Product.objects.count(), 1)
+
+        reused = self.client.post(
+            self.BASE_URL,
+            {**self.product_data, "quantity": 1},
+            HTTP_IDEMPOTENCY_KEY="abc",
+        )
+
+        self.assertEqual(reused.status_code, 422)
+
+    def test_listing_only_shows_active_products(self):
+        """
+        Verifica se a listagem padrão traz apenas produtos ativos
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+
+        Product.objects.create(
+            description="Ativo", price=10, quantity=1, seller=seller
+        )
+        Product.objects.create(
+            description="Inativo",
+            price=10,
+            quantity=1,
+            is_active=False,
+            seller=seller,
+        )
+
+        response = self.client.get(self.BASE_URL)
+
+        self.assertEqual(response.data["count"], 1)
+
+        response = self.client.get(f"{self.BASE_URL}?include_inactive=true")
+
+        self.assertEqual(response.data["count"], 2)
+
+    def test_archive_long_inactive_products(self):
+        """
+        Verifica se produtos inativos há muito tempo são movidos para o
+        arquivo e listados no endpoint de arquivados
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+
+        old = Product.objects.create(
+            description="Antigo",
+            price=10,
+            quantity=1,
+            is_active=False,
+            seller=seller,
+        )
+        Product.objects.filter(id=old.id).update(
+            updated_at=timezone.now() - timedelta(days=365)
+        )
+        Product.objects.create(
+            description="Recente",
+            price=10,
+            quantity=1,
+            is_active=False,
+            seller=seller,
+        )
+
+        call_command("archive_products", "--batch-size=1", stdout=StringIO())
+
+        self.assertEqual(Product.objects.count(), 1)
+
+        response = self.client.get(f"{self.BASE_URL}archived/")
+
+        self.assertEqual(response.data["count"], 1)
+
+        self.assertEqual(response.data["results"][0]["id"], str(old.id))
+
+    @override_settings(PRODUCT_CHANGES_SAFETY_LAG=0)
+    def test_change_feed_returns_deltas_since_cursor(self):
+        """
+        Verifica se o feed de mudanças retorna apenas as mudanças
+        posteriores ao cursor
+        """
+        self.client.post(self.ACCOUNT_URL, self.seller_account_data)
+
+        seller_login = self.client.post(
+            self.LOGIN_URL,
+            {
+                "username": self.seller_account_data["username"],
+                "password": self.seller_account_data["password"],
+            },
+        )
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {seller_login.data['token']}",
+        )
+
+        product = self.client.post(self.BASE_URL, self.product_data)
+
+        feed = self.client.get(f"{self.BASE_URL}changes/")
+
+        self.assertEqual(len(feed.data["results"]), 1)
+
+        self.assertEqual(feed.data["results"][0]["kind"], "created")
+
+        self.client.patch(
+            f"{self.BASE_URL}{product.data['id']}/", {"quantity": 3}
+        )
+
+        delta = self.client.get(
+            f"{self.BASE_URL}changes/?after={feed.data['next_cursor']}"
+        )
+
+        self.assertEqual(len(delta.data["results"]), 1)
+
+        self.assertEqual(delta.data["results"][0]["kind"], "updated")
+
+        self.assertEqual(delta.data["results"][0]["payload"]["quantity"], 3)
+
+    @override_settings(
+        PRODUCT_CHANGES_STREAM_SECONDS=0, PRODUCT_CHANGES_SAFETY_LAG=0
+    )
+    def test_change_stream_sends_server_sent_events(self):
+        """
+        Verifica se o stream de mudanças envia eventos a partir do
+        `Last-Event-ID`
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+
+        products = [
+            Product.objects.create(
+                description=f"Produto {index}",
+                price=10,
+                quantity=1,
+                seller=seller,
+            )
+            for index in range(2)
+        ]
+        first, _ = ProductChange.record(products, ProductChange.CREATED)
+
+        self.client.force_authenticate(seller)
+
+        response = self.client.get(
+            f"{self.BASE_URL}changes/stream/", HTTP_LAST_EVENT_ID=first.id
+        )
+
+        content = b"".join(response.streaming_content).decode()
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        self.assertEqual(content.count("event: created"), 1)
+
+        self.assertIn(str(products[1].id), content)
+
+    @override_settings(PRODUCT_CHANGES_SAFETY_LAG=60)
+    def test_change_feed_holds_back_recent_changes(self):
+        """
+        Verifica se o feed para na primeira mudança mais recente que a
+        margem de segurança, para não pular transações confirmadas depois
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+
+        products = [
+            Product.objects.create(
+                description=f"Produto {index}",
+                price=10,
+                quantity=1,
+                seller=seller,
+            )
+            for index in range(3)
+        ]
+        first, late, last = ProductChange.record(
+            products, ProductChange.CREATED
+        )
+        ProductChange.objects.exclude(pk=late.pk).update(
+            created_at=timezone.now() - timedelta(minutes=5)
+        )
+
+        self.client.force_authenticate(seller)
+
+        response = self.client.get(f"{self.BASE_URL}changes/")
+
+        self.assertEqual(
+            [change["id"] for change in response.data["results"]], [first.id]
+        )
+
+        self.assertEqual(response.data["next_cursor"], first.id)
+
+    @override_settings(
+        PRODUCT_CHANGES_HOLD_REQUESTS=False, PRODUCT_CHANGES_POLL_INTERVAL=60
+    )
+    def test_change_feed_does_not_wait_on_sync_workers(self):
+        """
+        Verifica se o long polling responde na hora quando o worker não
+        pode segurar a requisição
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+
+        self.client.force_authenticate(seller)
+
+        with mock.patch("products.views.time.sleep") as sleep:
+            response = self.client.get(f"{self.BASE_URL}changes/?wait=20")
+
+        self.assertEqual(response.data["results"], [])
+
+        sleep.assert_not_called()
+
+    def test_batch_lookup_by_ids(self):
+        """
+        Verifica se a busca em lote retorna os produtos por id, reporta
+        os ids ausentes e reaproveita o cache por objeto
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+
+        products = [
+            Product.objects.create(
+                description=f"Produto {index}",
+                price=10,
+                quantity=1,
+                seller=seller,
+            )
+            for index in range(3)
+        ]
+        missing = str(uuid.uuid4())
+        ids = [str(product.id) for product in products] + [missing]
+
+        response = self.client.get(
+            f"{self.BASE_URL}batch/?ids={','.join(ids)}"
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(len(response.data["results"]), 3)
+
+        self.assertEqual(response.data["missing"], [missing])
+
+        self.assertEqual(
+            response.data["results"][ids[0]]["seller"]["username"], "ale"
+        )
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(f"{self.BASE_URL}batch/?ids={ids[1]}")
+
+        self.assertEqual(cached.data["results"][ids[1]]["id"], ids[1])
+
+    def test_batch_lookup_rejects_invalid_ids(self):
+        """
+        Verifica se a busca em lote rejeita ids inválidos
+        """
+        response = self.client.get(f"{self.BASE_URL}batch/?ids=abc")
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_cached_detail_is_invalidated_on_update(self):
+        """
+        Verifica se o detalhe em cache é invalidado após atualização
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+        product = Product.objects.create(
+            description="Mouse", price=10, quantity=1, seller=seller
+        )
+        url = f"{self.BASE_URL}{product.id}/"
+
+        self.client.get(url)
+
+        self.client.force_authenticate(seller)
+
+        self.client.patch(url, {"quantity": 7})
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.data["quantity"], 7)
+
+    def test_cached_detail_ignores_id_spelling(self):
+        """
+        Verifica se o detalhe pedido com o id em maiúsculas usa a mesma
+        entrada de cache invalidada pela atualização
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+        product = Product.objects.create(
+            description="Mouse", price=10, quantity=1, seller=seller
+        )
+        url = f"{self.BASE_URL}{str(product.id).upper()}/"
+
+        self.client.get(url)
+
+        self.client.force_authenticate(seller)
+
+        self.client.patch(f"{self.BASE_URL}{product.id}/", {"quantity": 7})
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.data["quantity"], 7)
+
+    def test_seller_is_serialized_once_per_response(self):
+        """
+        Verifica se o vendedor embutido é carregado uma única vez para
+        vários produtos do mesmo vendedor
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+        ids = [
+            str(
+                Product.objects.create(
+                    description=f"Produto {index}",
+                    price=10,
+                    quantity=1,
+                    seller=seller,
+                ).id
+            )
+            for index in range(5)
+        ]
+
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                f"{self.BASE_URL}batch/?ids={','.join(ids)}"
+            )
+
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_embedded_seller_is_refreshed_after_account_update(self):
+        """
+        Verifica se o perfil do vendedor em cache é invalidado quando a
+        conta é atualizada
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+        product = Product.objects.create(
+            description="Mouse", price=10, quantity=1, seller=seller
+        )
+        url = f"{self.BASE_URL}{product.id}/"
+
+        self.client.get(url)
+
+        self.client.force_authenticate(seller)
+
+        self.client.patch(
+            f"{self.ACCOUNT_URL}{seller.id}/",
+            {"username": "xa"},
+            format="json",
+        )
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.data["seller"]["username"], "xa")
+
+    def test_embedded_seller_is_a_public_profile(self):
+        """
+        Verifica se o vendedor embutido no produto expõe apenas o perfil
+        público da conta
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+        product = Product.objects.create(
+            description="Mouse", price=10, quantity=1, seller=seller
+        )
+
+        response = self.client.get(f"{self.BASE_URL}{product.id}/")
+
+        self.assertEqual(
+            set(response.data["seller"]),
+            {"id", "username", "first_name", "last_name"},
+        )
+
+    def test_msgpack_content_negotiation(self):
+        """
+        Verifica se produtos podem ser criados e lidos em MessagePack,
+        preservando `Decimal` e `UUID`
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+
+        self.client.force_authenticate(seller)
+
+        created = self.client.post(
+            self.BASE_URL,
+            msgpack.packb(
+                {**self.product_data, "price": Decimal("99.75")},
+                default=encode_ext,
+            ),
+            content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack",
+        )
+
+        self.assertEqual(created.status_code, 201)
+
+        self.assertEqual(created["Content-Type"], "application/msgpack")
+
+        for _ in range(2):
+            response = self.client.get(
+                f"{self.BASE_URL}{created.data['id']}/",
+                HTTP_ACCEPT="application/msgpack",
+            )
+            data = msgpack.unpackb(response.content, ext_hook=decode_ext)
+
+            self.assertEqual(data["price"], Decimal("99.75"))
+
+            self.assertEqual(data["id"], uuid.UUID(created.data["id"]))
+
+            self.assertEqual(data["seller"]["id"], seller.id)
+
+    def test_msgpack_validation_errors(self):
+        """
+        Verifica se erros de validação são devolvidos em MessagePack com as
+        mensagens intactas
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+
+        self.client.force_authenticate(seller)
+
+        response = self.client.post(
+            self.BASE_URL,
+            msgpack.packb({**self.product_data, "price": "barato"}),
+            content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack",
+        )
+        data = msgpack.unpackb(response.content, ext_hook=decode_ext)
+
+        self.assertEqual(response.status_code, 400)
+
+        self.assertEqual(data["price"], ["A valid number is required."])
+
+    def test_msgpack_listing_types_match_read_model(self):
+        """
+        Verifica se a listagem em MessagePack devolve os mesmos tipos com e
+        sem o modelo de leitura
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+
+        self.client.force_authenticate(seller)
+
+        with override_settings(PRODUCT_LIST_READ_MODEL=True):
+            self.client.post(self.BASE_URL, self.product_data)
+
+        results = []
+
+        for read_model in (False, True):
+            with override_settings(PRODUCT_LIST_READ_MODEL=read_model):
+                response = self.client.get(
+                    self.BASE_URL, HTTP_ACCEPT="application/msgpack"
+                )
+
+            data = msgpack.unpackb(response.content, ext_hook=decode_ext)
+            results.append(data["results"])
+
+            self.assertEqual(data["results"][0]["seller_id"], seller.id)
+
+            self.assertEqual(data["results"][0]["price"], Decimal("99.75"))
+
+        self.assertEqual(results[0], results[1])
+
+    @override_settings(PRODUCT_LIST_READ_MODEL=True)
+    def test_listing_from_read_model(self):
+        """
+        Verifica se a listagem servida pelo modelo de leitura acompanha as
+        escritas e responde igual à listagem normalizada
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+
+        self.client.force_authenticate(seller)
+
+        created = self.client.post(self.BASE_URL, self.product_data)
+
+        self.client.patch(
+            f"{self.BASE_URL}{created.data['id']}/",
+            {"description": "Mouse feinho"},
+            format="json",
+        )
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.BASE_URL)
+
+        self.assertEqual(
+            response.data["results"][0]["description"], "Mouse feinho"
+        )
+
+        admin = Account.objects.create_superuser(
+            username="gohan", password="1234"
+        )
+
+        self.client.force_authenticate(admin)
+
+        self.client.patch(
+            f"{self.ACCOUNT_URL}management/",
+            {
+                "ids": [str(seller.id)],
+                "is_active": False,
+                "cascade_products": True,
+            },
+            format="json",
+        )
+
+        self.client.force_authenticate(seller)
+
+        self.client.post(self.BASE_URL, self.product_data)
+
+        response = self.client.get(self.BASE_URL)
+
+        self.assertEqual(response.data["count"], 1)
+
+        with override_settings(PRODUCT_LIST_READ_MODEL=False):
+            expected = self.client.get(self.BASE_URL)
+
+        self.assertEqual(response.json(), expected.json())
+
+        response = self.client.get(f"{self.BASE_URL}?include_inactive=true")
+
+        self.assertEqual(response.data["count"], 2)
+
+    def test_rebuild_product_list_read_model(self):
+        """
+        Verifica se o comando reconstrói o modelo de leitura a partir da
+        tabela de produtos
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+        product = Product.objects.create(
+            description="Mouse", price=10, quantity=1, seller=seller
+        )
+
+        call_command("rebuild_product_list", stdout=StringIO())
+
+        entry = ProductListEntry.objects.get()
+
+        self.assertEqual(entry.product_id, product.id)
+
+        self.assertEqual(entry.row["seller_id"], str(seller.id))
+
+    @override_settings(PAGINATION_MAX_PAGE_SIZE=3)
+    def test_client_page_size_is_capped(self):
+        """
+        Verifica se o cliente escolhe o tamanho da página até o máximo
+        configurado no servidor
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+
+        for index in range(5):
+            Product.objects.create(
+                description=f"Produto {index}",
+                price=10,
+                quantity=1,
+                seller=seller,
+            )
+
+        response = self.client.get(self.BASE_URL)
+
+        self.assertEqual(len(response.data["results"]), 2)
+
+        response = self.client.get(f"{self.BASE_URL}?page_size=50")
+
+        self.assertEqual(len(response.data["results"]), 3)
+
+        self.assertEqual(response.data["count"], 5)
+
+    def test_listing_count_is_kept_in_cache(self):
+        """
+        Verifica se o total da listagem vem de um contador em cache
+        mantido nas criações, sem `COUNT(*)` a cada requisição
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+
+        self.client.force_authenticate(seller)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.BASE_URL, self.product_data)
+
+        self.assertEqual(self.client.get(self.BASE_URL).data["count"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.BASE_URL, self.product_data)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.BASE_URL)
+
+        self.assertEqual(response.data["count"], 2)
+
+        self.assertEqual(response.data["count_type"], "cached")
+
+    def test_listing_count_follows_committed_changes_only(self):
+        """
+        Verifica se o contador em cache só é ajustado quando a escrita é
+        confirmada e não é descartado por atualizações sem mudança de
+        `is_active`
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+
+        self.client.force_authenticate(seller)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            product = self.client.post(self.BASE_URL, self.product_data)
+
+        self.assertEqual(self.client.get(self.BASE_URL).data["count"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(DatabaseError), transaction.atomic():
+                ProductChange.record(
+                    [Product.objects.get(id=product.data["id"])],
+                    ProductChange.CREATED,
+                )
+
+                raise DatabaseError
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                f"{self.BASE_URL}{product.data['id']}/", {"quantity": 3}
+            )
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.BASE_URL)
+
+        self.assertEqual(response.data["count"], 1)
+
+    def test_signed_token_authenticates_without_account_query(self):
+        """
+        Verifica se o token assinado autentica vendedores sem consultar a
+        conta e deixa de valer quando a conta é desativada
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+        admin = Account.objects.create_superuser(
+            username="gohan", password="1234"
+        )
+
+        login = self.client.post(
+            f"{self.LOGIN_URL}signed/",
+            {"username": "ale", "password": "abcd"},
+        )
+        authorization = f"Bearer {login.data['token']}"
+
+        with self.assertNumQueries(1):
+            self.client.get(
+                f"{self.BASE_URL}changes/?wait=0",
+                HTTP_AUTHORIZATION=authorization,
+            )
+
+        response = self.client.post(
+            self.BASE_URL, self.product_data, HTTP_AUTHORIZATION=authorization
+        )
+
+        self.assertEqual(response.status_code, 201)
+
+        self.assertEqual(str(response.data["seller"]["id"]), str(seller.id))
+
+        self.client.force_authenticate(admin)
+        self.client.patch(
+            f"{self.ACCOUNT_URL}{seller.id}/management/",
+            {"is_active": False},
+            format="json",
+        )
+        self.client.force_authenticate(None)
+
+        response = self.client.post(
+            self.BASE_URL, self.product_data, HTTP_AUTHORIZATION=authorization
+        )
+
+        self.assertEqual(response.status_code, 401)
+
+        response = self.client.post(
+            self.BASE_URL,
+            self.product_data,
+            HTTP_AUTHORIZATION=f"{authorization}x",
+        )
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_owner_patch_does_not_load_seller(self):
+        """
+        Verifica se a checagem de dono compara `seller_id` sem buscar a
+        conta do vendedor
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+        other = Account.objects.create_user(
+            username="deb", password="1234", is_seller=True
+        )
+        product = Product.objects.create(
+            description="Mouse", price=10, quantity=1, seller=seller
+        )
+        url = f"{self.BASE_URL}{product.id}/"
+
+        self.client.get(url)
+
+        self.client.force_authenticate(other)
+
+        with self.assertNumQueries(1):
+            response = self.client.patch(url, {"quantity": 2}, format="json")
+
+        self.assertEqual(response.status_code, 403)
+
+        self.client.force_authenticate(seller)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(url, {"quantity": 2}, format="json")
+
+        statements = [
+            query["sql"]
+            for query in queries
+            if "SAVEPOINT" not in query["sql"]
+        ]
+
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(len(statements), 3)
+
+        self.assertFalse(
+            any("accounts_account" in statement for statement in statements)
+        )
+
+    def test_conditional_update_with_if_match(self):
+        """
+        Verifica se o PATCH grava só o que mudou e recusa versões
+        desatualizadas enviadas em `If-Match`
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+        product = Product.objects.create(
+            description="Mouse", price=10, quantity=1, seller=seller
+        )
+        url = f"{self.BASE_URL}{product.id}/"
+
+        self.client.force_authenticate(seller)
+
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.patch(
+            url, {"quantity": 5}, format="json", HTTP_IF_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(response.data["version"], 2)
+
+        response = self.client.patch(
+            url, {"quantity": 7}, format="json", HTTP_IF_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 412)
+
+        response = self.client.patch(url, {"quantity": 5}, format="json")
+
+        self.assertEqual(response["ETag"], '"2"')
+
+        self.assertEqual(ProductChange.objects.count(), 1)
+
+        product.refresh_from_db()
+
+        self.assertEqual((product.quantity, product.version), (5, 2))
+
+    @override_settings(PRODUCT_CHANGES_SAFETY_LAG=0)
+    def test_price_history_and_daily_rollup(self):
+        """
+        Verifica se mudanças de preço e estoque ficam no histórico e se o
+        resumo diário é servido a partir do rollup
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+
+        self.client.force_authenticate(seller)
+
+        created = self.client.post(self.BASE_URL, self.product_data)
+        url = f"{self.BASE_URL}{created.data['id']}/"
+
+        for price in ("120.00", "120.00", "80.00"):
+            self.client.patch(url, {"price": price}, format="json")
+
+        self.client.patch(url, {"description": "Mouse"}, format="json")
+
+        self.assertFalse(self.client.get(f"{url}prices/").data["results"])
+
+        call_command("record_price_points", stdout=StringIO())
+
+        response = self.client.get(f"{url}prices/")
+
+        self.assertEqual(
+            [point["price"] for point in response.data["results"]],
+            ["99.75", "120.00", "80.00"],
+        )
+
+        since = timezone.now() + timedelta(minutes=1)
+        response = self.client.get(
+            f"{url}prices/", {"since": since.isoformat()}
+        )
+
+        self.assertEqual(response.data["results"], [])
+
+        call_command("rollup_prices", stdout=StringIO())
+
+        response = self.client.get(f"{url}prices/daily/")
+        day = response.data["results"][0]
+
+        self.assertEqual(
+            (day["min_price"], day["max_price"], day["samples"]),
+            ("80.00", "120.00", 3),
+        )
+
+    @override_settings(PRODUCT_CHANGES_SAFETY_LAG=0)
+    def test_daily_rollup_carries_previous_price(self):
+        """
+        Verifica se o resumo diário considera o preço herdado do dia
+        anterior e cria linhas para dias sem mudança
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+
+        self.client.force_authenticate(seller)
+
+        created = self.client.post(self.BASE_URL, self.product_data)
+        url = f"{self.BASE_URL}{created.data['id']}/"
+        today = timezone.localdate()
+
+        call_command("record_price_points", stdout=StringIO())
+        ProductPricePoint.objects.update(
+            recorded_at=timezone.now() - timedelta(days=2)
+        )
+
+        self.client.patch(url, {"price": "120.00"}, format="json")
+
+        call_command("rollup_prices", "--days", "3", stdout=StringIO())
+
+        response = self.client.get(f"{url}prices/daily/")
+
+        self.assertEqual(
+            [
+                (day["day"], day["min_price"], day["max_price"])
+                for day in response.data["results"]
+            ],
+            [
+                (str(today - timedelta(days=2)), "99.75", "99.75"),
+                (str(today - timedelta(days=1)), "99.75", "99.75"),
+                (str(today), "99.75", "120.00"),
+            ],
+        )
+
+        self.assertEqual(response.data["results"][2]["avg_price"], "109.88")
+
+
+class ProductStampedeTests(APITransactionTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_concurrent_misses_load_product_once(self):
+        """
+        Verifica se requisições simultâneas a um produto fora do cache
+        consultam o banco uma única vez
+        """
+        seller = Account.objects.create_user(
+            username="ale", password="abcd", is_seller=True
+        )
+        product = Product.objects.create(
+            description="Mouse", price=10, quantity=1, seller=seller
+        )
+        url = f"/api/products/{product.id}/"
+        get_object = ProductDetailView.get_object
+        loads = []
+        responses = []
+
+        def load(view):
+            loads.append(view)
+            time.sleep(0.2)
+
+            return get_object(view)
+
+        def request():
+            try:
+                responses.append(APIClient().get(url))
+            finally:
+                connections.close_all()
+
+        with mock.patch.object(ProductDetailView, "get_object", load):
+            threads = [threading.Thread(target=request) for _ in range(8)]
+
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(loads), 1)
+
+        self.assertEqual(
+            {response.data["description"] for response in responses},
+            {"Mouse"},
+        )
+
+
+@override_settings(PRODUCT_SHARDS=["default", "sqlite3"])
+class ProductShardingTests(APITestCase):
+    databases = {"default", "sqlite3"}
+
+    def setUp(self) -> None:
+        cache.clear()
+
+        self.sellers = {}
+
+        for number in range(1, 100):
+            seller_id = uuid.UUID(int=number)
+            self.sellers.setdefault(shard_for(seller_id), seller_id)
+
+            if len(self.sellers) == 2:
+                break
+
+        for alias, seller_id in self.sellers.items():
+            Account.objects.create_user(
+                id=seller_id, username=alias, password="abcd", is_seller=True
+            )
+
+    def test_products_are_stored_and_read_by_seller_shard(self):
+        """
+        Verifica se cada produto é gravado no banco do vendedor e se
+        listagem, detalhe, edição e lote consultam todos os bancos
+        """
+        ids = []
+
+        for alias, seller_id in self.sellers.items():
+            self.client.force_authenticate(Account.objects.get(id=seller_id))
+
+            response = self.client.post(
+                "/api/products/",
+                {"description": alias, "price": 10, "quantity": 1},
+            )
+            ids.append(response.data["id"])
+
+            self.assertTrue(
+                Product.objects.using(alias)
+                .filter(id=response.data["id"])
+                .exists()
+            )
+
+        response = self.client.get("/api/products/")
+
+        self.assertEqual(response.data["count"], 2)
+
+        self.assertEqual(
+            [product["description"] for product in response.data["results"]],
+            [alias for _, alias in sorted(zip(ids, self.sellers))],
+        )
+
+        response = self.client.patch(
+            f"/api/products/{ids[1]}/", {"quantity": 5}, format="json"
+        )
+
+        self.assertEqual(response.data["version"], 2)
+
+        response = self.client.get(f"/api/products/{ids[1]}/")
+
+        self.assertEqual(response.data["quantity"], 5)
+
+        response = self.client.get(
+            "/api/products/batch/", {"ids": ",".join(ids)}
+        )
+
+        self.assertEqual(sorted(response.data["results"]), sorted(ids))
+
+    def test_product_creation_rolls_back_on_the_seller_shard(self):
+        """
+        Verifica se uma falha ao registrar a mudança desfaz a criação do
+        produto também no banco do vendedor
+        """
+        seller_id = self.sellers["sqlite3"]
+        self.client.force_authenticate(Account.objects.get(id=seller_id))
+
+        with mock.patch.object(
+            ProductChange, "record", side_effect=DatabaseError
+        ), self.assertRaises(DatabaseError):
+            self.client.post(
+                "/api/products/",
+                {"description": "Mouse", "price": 10, "quantity": 1},
+            )
+
+        self.assertFalse(Product.objects.using("sqlite3").exists())
+
+    def test_deleted_seller_takes_sharded_products_along(self):
+        """
+        Verifica se excluir um vendedor remove seus produtos do banco do
+        vendedor e se o produto deixa de ser encontrado
+        """
+        seller = Account.objects.get(id=self.sellers["sqlite3"])
+        self.client.force_authenticate(seller)
+
+        response = self.client.post(
+            "/api/products/",
+            {"description": "Mouse", "price": 10, "quantity": 1},
+        )
+        product_id = response.data["id"]
+
+        self.client.get(f"/api/products/{product_id}/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            seller.delete()
+
+        self.assertFalse(Product.objects.using("sqlite3").exists())
+
+        response = self.client.get(f"/api/products/{product_id}/")
+
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.get(
+            "/api/products/batch/", {"ids": product_id}
+        )
+
+        self.assertEqual(response.data["results"], {})
@@ -1,8 +1,14 @@
 import uuid
+from io import StringIO
+from operator import attrgetter
 
 from accounts.models import Account
-from django.test import TestCase
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
 from products.models import Product
+from products.partitioning import partitions_for
+from products.routers import scatter, shard_for
+from products.serializers import DetailedProductSerializer
 
 
 class ProductsModelTests(TestCase):
@@ -136,3 +142,91 @@ class ProductAccountRelationshipTest(TestCase):
         self.assertNotIn(self.product_1, self.account_1.products.all())
 
         self.assertIn(self.product_1, self.account_2.products.all())
+
+
+@override_settings(PRODUCT_SHARDS=["default", "sqlite3"])
+class ProductShardRouterTests(TestCase):
+    databases = {"default", "sqlite3"}
+
+    def test_products_follow_their_seller_shard(self):
+        """
+        Verifica se os produtos ficam no banco do vendedor e se a leitura
+        espalhada mescla os bancos na ordem da consulta
+        """
+        products = []
+
+        for number in range(1, 7):
+            seller = Account.objects.create_user(
+                id=uuid.UUID(int=number), username=str(number)
+            )
+            products.append(
+                Product.objects.create(
+                    description="Mouse", price=10, quantity=1, seller=seller
+                )
+            )
+
+            self.assertEqual(products[-1]._state.db, shard_for(seller.id))
+
+            self.assertEqual(list(seller.products.all()), [products[-1]])
+
+        self.assertEqual(
+            {product._state.db for product in products}, {"default", "sqlite3"}
+        )
+
+        merged = scatter(Product.objects.order_by("-id"))
+
+        self.assertEqual(merged.count(), 6)
+
+        self.assertEqual(
+            merged[1:4],
+            sorted(products, key=attrgetter("id"), reverse=True)[1:4],
+        )
+
+        self.assertEqual(merged.get(id=products[0].id), products[0])
+
+
+    def test_product_of_missing_seller_has_no_seller(self):
+        """
+        Verifica se um produto cujo vendedor não existe é serializado sem
+        vendedor em vez de falhar
+        """
+        product = Product.objects.create(
+            description="Mouse", price=10, quantity=1, seller_id=uuid.uuid4()
+        )
+
+        self.assertIsNone(DetailedProductSerializer(product).data["seller"])
+
+
+class ProductPartitioningTests(TestCase):
+    def test_partitioning_is_postgres_only(self):
+        """
+        Verifica se o particionamento é recusado fora do Postgres
+        """
+        with self.assertRaises(CommandError):
+            call_command("partition_products", stdout=StringIO())
+
+        self.assertEqual(len(partitions_for("seller_id", 4)), 4)
+
+    @override_settings(PRODUCT_PARTITIONING="is_active")
+    def test_updates_target_the_product_partition(self):
+        """
+        Verifica se a edição filtra pela chave de partição do produto e
+        ainda encontra produtos que mudaram de partição
+        """
+        seller = Account.objects.create_user(username="ale", is_seller=True)
+        product = Product.objects.create(
+            description="Mouse", price=10, quantity=1, seller=seller
+        )
+
+        self.assertEqual(product.partition_lookup(), {"is_active": True})
+
+        Product.objects.update(is_active=False)
+        serializer = DetailedProductSerializer(
+            product, data={"quantity": 5}, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        product.refresh_from_db()
+
+        self.assertEqual((product.quantity, product.version), (5, 2))
@@ -4,5 +4,14 @@ from . import views
 
 urlpatterns = [
     path("products/", views.ProductView.as_view()),
+    path("products/archived/", views.ArchivedProductView.as_view()),
+    path("products/batch/", views.ProductBatchView.as_view()),
+    path("products/changes/", views.ProductChangeView.as_view()),
+    path("products/changes/stream/", views.ProductChangeStreamView.as_view()),
     path("products/<pk>/", views.ProductDetailView.as_view()),
+    path("products/<pk>/prices/", views.ProductPriceHistoryView.as_view()),
+    path(
+        "products/<pk>/prices/daily/",
+        views.ProductDailyPriceView.as_view(),
+    ),
 ]
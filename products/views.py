@@ -1,15 +1,46 @@
-from rest_framework import generics
-from rest_framework.authentication import TokenAuthentication
-from utils.mixins import SerializerByMethodMixin
+import json
+import time
+import uuid
 
-from .models import Product
+from accounts.authentication import (ExpiringTokenAuthentication,
+                                     SignedTokenAuthentication)
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from rest_framework import generics, serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+from utils.mixins import (IdempotentCreateMixin, SerializerByMethodMixin,
+                          VersionedUpdateMixin)
+from utils.throttling import WriteRateThrottle
+
+from .cache import (ACTIVE_PRODUCTS, ALL_PRODUCTS, ARCHIVED_PRODUCTS,
+                    cache_products, get_cached_products, get_product,
+                    invalidate_products)
+from .models import (ArchivedProduct, Product, ProductChange,
+                     ProductDailyPrice, ProductListEntry, ProductPricePoint)
 from .permissions import IsProductOwnerOrReadOnly, IsSellerOrReadOnly
-from .serializers import DetailedProductSerializer, GenericProductSerializer
+from .routers import scatter, shard_for
+from .serializers import (ArchivedProductSerializer, DetailedProductSerializer,
+                          GenericProductSerializer, ProductChangeSerializer,
+                          ProductDailyPriceSerializer,
+                          ProductPricePointSerializer)
 
 
-class ProductView(SerializerByMethodMixin, generics.ListCreateAPIView):
-    authentication_classes = [TokenAuthentication]
+class ProductView(
+    IdempotentCreateMixin, SerializerByMethodMixin, generics.ListCreateAPIView
+):
+    authentication_classes = [
+        ExpiringTokenAuthentication,
+        SignedTokenAuthentication,
+    ]
     permission_classes = [IsSellerOrReadOnly]
+    throttle_classes = [WriteRateThrottle]
+
+    count_mode = "cached"
 
     queryset = Product.objects.all()
     serializer_map = {
@@ -17,13 +48,287 @@ class ProductView(SerializerByMethodMixin, generics.ListCreateAPIView):
         "POST": DetailedProductSerializer,
     }
 
+    def get_queryset(self):
+        queryset = self.queryset.order_by("id")
+
+        if self.request.query_params.get("include_inactive") != "true":
+            queryset = queryset.active()
+
+        return scatter(queryset)
+
+    def get_counter(self):
+        if self.request.query_params.get("include_inactive") == "true":
+            return ALL_PRODUCTS
+
+        return ACTIVE_PRODUCTS
+
+    def list(self, request, *args, **kwargs):
+        if not settings.PRODUCT_LIST_READ_MODEL:
+            return super().list(request, *args, **kwargs)
+
+        entries = ProductListEntry.objects.order_by("product_id")
+
+        if request.query_params.get("include_inactive") != "true":
+            entries = entries.filter(is_active=True)
+
+        page = self.paginate_queryset(entries.values_list("row", flat=True))
+
+        return self.get_paginated_response(
+            ReturnList(page, serializer=self.get_serializer(many=True))
+        )
+
     def perform_create(self, serializer):
-        serializer.save(seller=self.request.user)
+        using = shard_for(self.request.user.pk)
+
+        with transaction.atomic(), transaction.atomic(using=using):
+            product = serializer.save(seller_id=self.request.user.pk)
+            ProductChange.record([product], ProductChange.CREATED)
 
 
-class ProductDetailView(generics.RetrieveUpdateAPIView):
-    authentication_classes = [TokenAuthentication]
+class ProductDetailView(VersionedUpdateMixin, generics.RetrieveUpdateAPIView):
+    authentication_classes = [
+        ExpiringTokenAuthentication,
+        SignedTokenAuthentication,
+    ]
     permission_classes = [IsProductOwnerOrReadOnly]
+    throttle_classes = [WriteRateThrottle]
 
     queryset = Product.objects.all()
     serializer_class = DetailedProductSerializer
+
+    def get_queryset(self):
+        return scatter(super().get_queryset())
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            pk = uuid.UUID(kwargs["pk"])
+        except ValueError:
+            raise NotFound()
+
+        data = get_product(
+            pk, lambda: self.get_serializer(self.get_object()).data
+        )
+
+        return Response(
+            ReturnDict(data, serializer=self.get_serializer()),
+            headers={"ETag": f'"{data["version"]}"'},
+        )
+
+    def perform_update(self, serializer):
+        using = shard_for(serializer.instance.seller_id)
+
+        with transaction.atomic(), transaction.atomic(using=using):
+            product = serializer.save()
+
+            if not serializer.changed_fields:
+                return
+
+            ProductChange.record([product], ProductChange.UPDATED)
+
+        invalidate_products([product.id])
+
+
+class ProductBatchView(generics.GenericAPIView):
+    authentication_classes = [
+        ExpiringTokenAuthentication,
+        SignedTokenAuthentication,
+    ]
+
+    serializer_class = DetailedProductSerializer
+
+    def get(self, request, *args, **kwargs):
+        ids = self.get_ids()
+        found = get_cached_products(ids)
+        misses = [pk for pk in ids if pk not in found]
+
+        if misses:
+            products = scatter(Product.objects.filter(id__in=misses))
+            fetched = {
+                data["id"]: data
+                for data in self.get_serializer(products, many=True).data
+            }
+            cache_products(fetched)
+            found.update(fetched)
+
+        serializer = self.get_serializer()
+
+        return Response(
+            {
+                "results": {
+                    pk: ReturnDict(found[pk], serializer=serializer)
+                    for pk in ids
+                    if pk in found
+                },
+                "missing": [pk for pk in ids if pk not in found],
+            }
+        )
+
+    def get_ids(self) -> list:
+        raw = self.request.query_params.get("ids", "")
+        ids = serializers.ListField(
+            child=serializers.UUIDField(),
+            min_length=1,
+            max_length=settings.PRODUCT_BATCH_MAX_IDS,
+        ).run_validation([pk for pk in raw.split(",") if pk])
+
+        return list(dict.fromkeys(str(pk) for pk in ids))
+
+
+class ProductPriceHistoryView(generics.ListAPIView):
+    count_mode = "none"
+    page_size = 100
+
+    serializer_class = ProductPricePointSerializer
+
+    def get_queryset(self):
+        queryset = ProductPricePoint.objects.filter(
+            product_id=self.get_product_id()
+        ).order_by("recorded_at")
+
+        return self.filter_range(
+            queryset, "recorded_at", serializers.DateTimeField()
+        )
+
+    def get_product_id(self):
+        return serializers.UUIDField().run_validation(self.kwargs["pk"])
+
+    def filter_range(self, queryset, field: str, parser):
+        since = self.request.query_params.get("since")
+        until = self.request.query_params.get("until")
+
+        if since:
+            since = parser.run_validation(since)
+            queryset = queryset.filter(**{f"{field}__gte": since})
+
+        if until:
+            until = parser.run_validation(until)
+            queryset = queryset.filter(**{f"{field}__lt": until})
+
+        return queryset
+
+
+class ProductDailyPriceView(ProductPriceHistoryView):
+    serializer_class = ProductDailyPriceSerializer
+
+    def get_queryset(self):
+        queryset = ProductDailyPrice.objects.filter(
+            product_id=self.get_product_id()
+        ).order_by("day")
+
+        return self.filter_range(queryset, "day", serializers.DateField())
+
+
+class ArchivedProductView(generics.ListAPIView):
+    count_mode = "cached"
+    page_size = 50
+
+    serializer_class = ArchivedProductSerializer
+
+    def get_queryset(self):
+        queryset = ArchivedProduct.objects.order_by("-archived_at")
+        seller = self.request.query_params.get("seller")
+
+        if seller:
+            seller = serializers.UUIDField().run_validation(seller)
+            queryset = queryset.filter(seller_id=seller)
+
+        return queryset
+
+    def get_counter(self):
+        if "seller" in self.request.query_params:
+            return None
+
+        return ARCHIVED_PRODUCTS
+
+
+class ProductChangeView(generics.GenericAPIView):
+    authentication_classes = [
+        ExpiringTokenAuthentication,
+        SignedTokenAuthentication,
+    ]
+    permission_classes = [IsAuthenticated]
+
+    serializer_class = ProductChangeSerializer
+
+    def get(self, request, *args, **kwargs):
+        after = self.get_cursor(request.query_params.get("after"))
+        limit = self.get_limit()
+        wait = serializers.FloatField(
+            min_value=0, max_value=settings.PRODUCT_CHANGES_MAX_WAIT
+        ).run_validation(request.query_params.get("wait", 0))
+
+        if not settings.PRODUCT_CHANGES_HOLD_REQUESTS:
+            wait = 0
+
+        deadline = time.monotonic() + wait
+        changes = self.fetch(after, limit)
+
+        while not changes and time.monotonic() < deadline:
+            time.sleep(settings.PRODUCT_CHANGES_POLL_INTERVAL)
+            changes = self.fetch(after, limit)
+
+        return Response(
+            {
+                "results": self.get_serializer(changes, many=True).data,
+                "next_cursor": changes[-1].id if changes else after,
+            }
+        )
+
+    def get_cursor(self, value) -> int:
+        return serializers.IntegerField(min_value=0).run_validation(value or 0)
+
+    def get_limit(self) -> int:
+        return serializers.IntegerField(
+            min_value=1, max_value=settings.PRODUCT_CHANGES_MAX_BATCH
+        ).run_validation(
+            self.request.query_params.get(
+                "limit", settings.PRODUCT_CHANGES_MAX_BATCH
+            )
+        )
+
+    def fetch(self, after: int, limit: int) -> list:
+        return ProductChange.settled(after, limit)
+
+
+class ProductChangeStreamView(ProductChangeView):
+    def get(self, request, *args, **kwargs):
+        after = self.get_cursor(
+            request.headers.get("Last-Event-ID")
+            or request.query_params.get("after")
+        )
+
+        response = StreamingHttpResponse(
+            self.stream(after, self.get_limit()),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+
+        return response
+
+    def stream(self, after: int, limit: int):
+        seconds = settings.PRODUCT_CHANGES_STREAM_SECONDS
+
+        if not settings.PRODUCT_CHANGES_HOLD_REQUESTS:
+            seconds = 0
+
+        deadline = time.monotonic() + seconds
+
+        yield "retry: 1000\n\n"
+
+        while True:
+            changes = self.fetch(after, limit)
+
+            for change in changes:
+                data = json.dumps(
+                    self.get_serializer(change).data, cls=JSONEncoder
+                )
+                yield f"id: {change.id}\nevent: {change.kind}\ndata: {data}\n\n"
+                after = change.id
+
+            if time.monotonic() >= deadline:
+                return
+
+            if not changes:
+                yield ": keepalive\n\n"
+                time.sleep(settings.PRODUCT_CHANGES_POLL_INTERVAL)
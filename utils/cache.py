@@ -0,0 +1,265 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_expires_idx ON cache (expires);
+CREATE INDEX IF NOT EXISTS cache_accessed_idx ON cache (accessed);
+"""
+
+LIVE = "(expires IS NULL OR expires > ?)"
+
+
+class SQLiteCache(BaseCache):
+    """Cache stored in one SQLite file in WAL mode, shared by every worker
+    process on the host.
+
+    Integers are stored as SQLite integers so `incr` is a single atomic
+    `UPDATE`; other values are pickled. Entries past `MAX_ENTRIES` are
+    evicted least recently used first, with access times refreshed at
+    most once per `ACCESS_RESOLUTION` seconds to keep reads from writing.
+    Keys starting with one of `PINNED_PREFIXES` are neither evicted nor
+    counted against `MAX_ENTRIES`, only expired, so state that must
+    survive cache pressure (revocations, locks, throttle counters) can
+    share the file with plain cached data.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+
+        self.location = location
+        self.access_resolution = options.get("ACCESS_RESOLUTION", 1.0)
+        self.cull_every = options.get("CULL_EVERY", 100)
+        self.busy_timeout = options.get("BUSY_TIMEOUT", 5.0)
+        self.pinned_prefixes = tuple(options.get("PINNED_PREFIXES", ()))
+        self.local = threading.local()
+        self.writes = 0
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        pid = os.getpid()
+
+        if getattr(self.local, "pid", None) != pid:
+            connection = sqlite3.connect(
+                self.location,
+                timeout=self.busy_timeout,
+                isolation_level=None,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+
+            self.local.connection = connection
+            self.local.pid = pid
+
+        return self.local.connection
+
+    @contextmanager
+    def transaction(self):
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        connection.execute("COMMIT")
+
+    def encode(self, value):
+        if type(value) is int:
+            return value
+
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, value):
+        if isinstance(value, int):
+            return value
+
+        return pickle.loads(value)
+
+    def get(self, key, default=None, version=None):
+        return self.get_many([key], version=version).get(key, default)
+
+    def get_many(self, keys, version=None):
+        keys = {self.make_and_validate_key(key, version): key for key in keys}
+        now = time.time()
+        found = {}
+        stale = []
+
+        for chunk in self.chunks(list(keys)):
+            rows = self.connection.execute(
+                f"SELECT key, value, accessed FROM cache WHERE {LIVE} "
+                f"AND key IN ({', '.join('?' * len(chunk))})",
+                [now, *chunk],
+            )
+
+            for key, value, accessed in rows:
+                found[keys[key]] = self.decode(value)
+
+                if now - accessed > self.access_resolution:
+                    stale.append((now, key))
+
+        if stale:
+            with self.transaction() as connection:
+                connection.executemany(
+                    "UPDATE cache SET accessed = ? WHERE key = ?", stale
+                )
+
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.set_many({key: value}, timeout, version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires = self.get_backend_timeout(timeout)
+        now = time.time()
+        rows = [
+            (
+                self.make_and_validate_key(key, version),
+                self.encode(value),
+                expires,
+                now,
+            )
+            for key, value in data.items()
+        ]
+
+        with self.transaction() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)", rows
+            )
+
+        self.maybe_cull(len(rows))
+
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        now = time.time()
+        cursor = self.connection.execute(
+            "INSERT INTO cache VALUES (?, ?, ?, ?) ON CONFLICT (key) DO "
+            "UPDATE SET value = excluded.value, expires = excluded.expires, "
+            "accessed = excluded.accessed "
+            "WHERE cache.expires IS NOT NULL AND cache.expires <= ?",
+            [
+                self.make_and_validate_key(key, version),
+                self.encode(value),
+                self.get_backend_timeout(timeout),
+                now,
+                now,
+            ],
+        )
+        self.maybe_cull(cursor.rowcount)
+
+        return cursor.rowcount == 1
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        now = time.time()
+        cursor = self.connection.execute(
+            f"UPDATE cache SET expires = ? WHERE key = ? AND {LIVE}",
+            [
+                self.get_backend_timeout(timeout),
+                self.make_and_validate_key(key, version),
+                now,
+            ],
+        )
+
+        return cursor.rowcount == 1
+
+    def incr(self, key, delta=1, version=None):
+        row = self.connection.execute(
+            f"UPDATE cache SET value = value + ? WHERE key = ? AND {LIVE} "
+            "AND typeof(value) = 'integer' RETURNING value",
+            [delta, self.make_and_validate_key(key, version), time.time()],
+        ).fetchone()
+
+        if row is None:
+            raise ValueError(f"Key '{key}' not found")
+
+        return row[0]
+
+    def has_key(self, key, version=None):
+        row = self.connection.execute(
+            f"SELECT 1 FROM cache WHERE key = ? AND {LIVE}",
+            [self.make_and_validate_key(key, version), time.time()],
+        ).fetchone()
+
+        return row is not None
+
+    def delete(self, key, version=None):
+        cursor = self.connection.execute(
+            "DELETE FROM cache WHERE key = ?",
+            [self.make_and_validate_key(key, version)],
+        )
+
+        return cursor.rowcount == 1
+
+    def delete_many(self, keys, version=None):
+        with self.transaction() as connection:
+            connection.executemany(
+                "DELETE FROM cache WHERE key = ?",
+                [[self.make_and_validate_key(key, version)] for key in keys],
+            )
+
+    def clear(self):
+        self.connection.execute("DELETE FROM cache")
+
+    def close(self, **kwargs):
+        pass
+
+    def maybe_cull(self, written: int):
+        self.writes += written
+
+        if self.writes < self.cull_every:
+            return
+
+        self.writes = 0
+        self.cull()
+
+    def cull(self):
+        with self.transaction() as connection:
+            connection.execute(
+                "DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?",
+                [time.time()],
+            )
+            evictable, params = self.evictable()
+            (count,) = connection.execute(
+                f"SELECT COUNT(*) FROM cache WHERE {evictable}", params
+            ).fetchone()
+            excess = count - self._max_entries
+
+            if excess <= 0:
+                return
+
+            if self._cull_frequency:
+                excess = max(excess, count // self._cull_frequency)
+
+            connection.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache "
+                f"WHERE {evictable} ORDER BY accessed LIMIT ?)",
+                [*params, excess],
+            )
+
+    def evictable(self) -> tuple:
+        prefixes = [self.make_key(prefix) for prefix in self.pinned_prefixes]
+        conditions = ["substr(key, 1, ?) != ?"] * len(prefixes)
+        params = [arg for prefix in prefixes for arg in (len(prefix), prefix)]
+
+        return " AND ".join(conditions) or "1", params
+
+    @staticmethod
+    def chunks(keys, size=500):
+        for start in range(0, len(keys), size):
+            yield keys[start : start + size]
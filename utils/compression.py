@@ -0,0 +1,112 @@
+import zlib
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class GzipEncoder:
+    def __init__(self):
+        self.compressor = zlib.compressobj(
+            settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.compress(data) + self.compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self.compressor.flush()
+
+
+class BrotliEncoder:
+    def __init__(self):
+        self.compressor = brotli.Compressor(
+            quality=settings.COMPRESSION_BROTLI_QUALITY
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.process(data) + self.compressor.flush()
+
+    def finish(self) -> bytes:
+        return self.compressor.finish()
+
+
+class ZstdEncoder:
+    def __init__(self):
+        self.compressor = zstandard.ZstdCompressor(
+            level=settings.COMPRESSION_ZSTD_LEVEL
+        ).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.compress(data) + self.compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self.compressor.flush()
+
+
+ENCODERS = {"gzip": GzipEncoder}
+
+if zstandard is not None:
+    ENCODERS["zstd"] = ZstdEncoder
+
+if brotli is not None:
+    ENCODERS["br"] = BrotliEncoder
+
+PREFERENCE = ["br", "zstd", "gzip"]
+
+
+def negotiate_encoding(accept_encoding: str):
+    accepted = {}
+
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                continue
+
+        accepted[coding.strip().lower()] = quality
+
+    candidates = [
+        coding
+        for coding in PREFERENCE
+        if coding in ENCODERS
+        and accepted.get(coding, accepted.get("*", 0)) > 0
+    ]
+
+    if not candidates:
+        return None
+
+    return max(candidates, key=lambda coding: accepted.get(coding, 0))
+
+
+def compress(coding: str, data: bytes) -> bytes:
+    encoder = ENCODERS[coding]()
+    return encoder.compress(data) + encoder.finish()
+
+
+def compress_stream(coding: str, chunks):
+    encoder = ENCODERS[coding]()
+
+    for chunk in chunks:
+        compressed = encoder.compress(chunk)
+
+        if compressed:
+            yield compressed
+
+    yield encoder.finish()
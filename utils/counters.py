@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.cache import cache
+from utils.stampede import coalesce
+
+
+class CachedCounter:
+    """Row count kept in the cache and adjusted by the writers instead of
+    being recounted on every read. A missing or reset counter is rebuilt
+    with the exact count on the next read, by one request at a time.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.key = f"count:{name}"
+
+    def get(self, compute) -> int:
+        value = cache.get(self.key)
+
+        if value is None:
+            value = coalesce(
+                self.key,
+                lambda: cache.get(self.key),
+                lambda: self.add(compute),
+            )
+
+        return value
+
+    def add(self, compute) -> int:
+        value = compute()
+        cache.add(self.key, value, settings.COUNT_CACHE_TIMEOUT)
+
+        return value
+
+    def incr(self, delta: int = 1):
+        try:
+            cache.incr(self.key, delta)
+        except ValueError:
+            pass
+
+    def decr(self, delta: int = 1):
+        self.incr(-delta)
+
+    def reset(self):
+        cache.delete(self.key)
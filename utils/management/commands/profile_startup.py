@@ -0,0 +1,90 @@
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+STARTUP_SCRIPT = (
+    "import django; django.setup(); "
+    "import {urlconf}; "
+    "from django.core.wsgi import get_wsgi_application; "
+    "get_wsgi_application()"
+)
+
+
+class Command(BaseCommand):
+    help = "Reports per-module import time of a cold worker startup"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=25)
+        parser.add_argument(
+            "--sort",
+            choices=["self", "cumulative"],
+            default="cumulative",
+        )
+        parser.add_argument(
+            "--top-level",
+            action="store_true",
+            help="Only report top level packages",
+        )
+
+    def handle(self, *args, **options):
+        script = STARTUP_SCRIPT.format(urlconf=settings.ROOT_URLCONF)
+
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", script],
+            capture_output=True,
+            text=True,
+        )
+
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+
+        timings = self.parse(result.stderr, options["top_level"])
+        key = 0 if options["sort"] == "self" else 1
+        total = sum(self_us for self_us, _ in timings.values())
+
+        self.stdout.write(f"{'self (ms)':>10} {'cumul. (ms)':>12}  module")
+
+        ranked = sorted(timings.items(), key=lambda item: -item[1][key])
+
+        for name, (self_us, cumulative_us) in ranked[: options["limit"]]:
+            self.stdout.write(
+                f"{self_us / 1000:>10.1f} {cumulative_us / 1000:>12.1f}  {name}"
+            )
+
+        unit = "packages" if options["top_level"] else "modules"
+        self.stdout.write(
+            f"\n{len(timings)} {unit} imported in {total / 1000:.1f} ms"
+        )
+
+    def parse(self, output: str, top_level: bool) -> dict:
+        timings = {}
+
+        for line in output.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+
+            _, fields = line.split(":", 1)
+            self_us, cumulative_us, name = fields.split("|")
+
+            if not self_us.strip().isdigit():
+                continue
+
+            depth = len(name) - len(name.lstrip())
+            name = name.strip()
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+
+            if top_level:
+                name = name.split(".")[0]
+
+                if depth > 1:
+                    cumulative_us = 0
+
+            previous = timings.get(name, (0, 0))
+            timings[name] = (
+                previous[0] + self_us,
+                previous[1] + cumulative_us,
+            )
+
+        return timings
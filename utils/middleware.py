@@ -0,0 +1,122 @@
+import threading
+import time
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .compression import compress, compress_stream, negotiate_encoding
+
+
+class LoadSheddingMiddleware:
+    """
+    Rejects expensive requests with 429 before authentication or password
+    hashing when this worker is saturated: too many requests in flight, or
+    the request already waited too long in the router queue.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.paths = tuple(settings.LOAD_SHEDDING_PATHS)
+        self.methods = settings.LOAD_SHEDDING_METHODS
+        self.max_inflight = settings.LOAD_SHEDDING_MAX_INFLIGHT
+        self.max_queue_ms = settings.LOAD_SHEDDING_MAX_QUEUE_MS
+        self.inflight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        if request.method not in self.methods or not request.path.startswith(
+            self.paths
+        ):
+            return self.get_response(request)
+
+        if self.queued_too_long(request):
+            return self.shed()
+
+        with self.lock:
+            if self.max_inflight and self.inflight >= self.max_inflight:
+                return self.shed()
+
+            self.inflight += 1
+
+        try:
+            return self.get_response(request)
+        finally:
+            with self.lock:
+                self.inflight -= 1
+
+    def queued_too_long(self, request) -> bool:
+        started = request.headers.get("X-Request-Start")
+
+        if not self.max_queue_ms or not started:
+            return False
+
+        try:
+            started = float(started.removeprefix("t="))
+        except ValueError:
+            return False
+
+        if started < 1e11:
+            started *= 1000
+
+        return time.time() * 1000 - started > self.max_queue_ms
+
+    def shed(self):
+        response = JsonResponse(
+            {"detail": "Server is busy, try again later."},
+            status=429,
+        )
+        response["Retry-After"] = "1"
+
+        return response
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Like Django's GZipMiddleware, but negotiates brotli and zstd when their
+    packages are installed, and flushes every streamed chunk so
+    Server-Sent Events are delivered as they are produced.
+    """
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding"):
+            return response
+
+        if (
+            not response.streaming
+            and len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        coding = negotiate_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", "")
+        )
+
+        if coding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                coding, response.streaming_content
+            )
+            del response.headers["Content-Length"]
+        else:
+            compressed = compress(coding, response.content)
+
+            if len(compressed) >= len(response.content):
+                return response
+
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+
+        response.headers["Content-Encoding"] = coding
+
+        return response
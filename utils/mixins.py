@@ -1,3 +1,150 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from .exceptions import PreconditionFailed
+
+
 class SerializerByMethodMixin:
     def get_serializer_class(self, *args, **kwargs):
         return self.serializer_map.get(self.request.method, self.serializer_class)
+
+
+class IdempotentCreateMixin:
+    """Replays the stored response of a create retried with the same
+    `Idempotency-Key`. While the first request runs the key holds a
+    placeholder that expires after `IDEMPOTENCY_LOCK_TIMEOUT`, so a worker
+    killed mid-request does not block the key for the whole `ttl`.
+    """
+
+    idempotency_header = "Idempotency-Key"
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(self.idempotency_header)
+
+        if not key:
+            return super().create(request, *args, **kwargs)
+
+        if len(key) > 255:
+            return Response(
+                {"detail": f"{self.idempotency_header} is too long."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        cache_key = self.get_idempotency_cache_key(request, key)
+        fingerprint = hashlib.sha256(
+            json.dumps(request.data, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+        placeholder = (fingerprint, None, None, None)
+
+        if not cache.add(
+            cache_key, placeholder, settings.IDEMPOTENCY_LOCK_TIMEOUT
+        ):
+            return self.replay(cache.get(cache_key), fingerprint)
+
+        try:
+            response = super().create(request, *args, **kwargs)
+        except BaseException:
+            cache.delete(cache_key)
+            raise
+
+        if status.is_success(response.status_code):
+            entry = (
+                fingerprint,
+                response.status_code,
+                dict(response.data),
+                response.get("Location"),
+            )
+            cache.set(cache_key, entry, self.ttl)
+        else:
+            cache.delete(cache_key)
+
+        return response
+
+    @property
+    def ttl(self) -> int:
+        return settings.IDEMPOTENCY_KEY_TTL
+
+    def get_idempotency_cache_key(self, request, key: str) -> str:
+        if request.user and request.user.is_authenticated:
+            owner = request.user.pk
+        else:
+            owner = BaseThrottle().get_ident(request)
+
+        digest = hashlib.sha256(f"{owner}:{key}".encode()).hexdigest()
+
+        return f"idempotency:{request.path}:{digest}"
+
+    def replay(self, entry, fingerprint: str) -> Response:
+        if entry is None or entry[1] is None:
+            return Response(
+                {"detail": "A request with this key is already in progress."},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        if entry[0] != fingerprint:
+            return Response(
+                {"detail": "This key was already used with another payload."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+
+        _, status_code, data, location = entry
+        headers = {"Idempotent-Replayed": "true"}
+
+        if location:
+            headers["Location"] = location
+
+        return Response(
+            ReturnDict(data, serializer=self.get_serializer()),
+            status=status_code,
+            headers=headers,
+        )
+
+
+class VersionedUpdateMixin:
+    """Updates guarded by the `version` column: `If-Match` makes the write
+    conditional on that version and responses carry it as the `ETag`.
+    """
+
+    def get_expected_version(self):
+        header = self.request.headers.get("If-Match", "*").strip()
+
+        if header == "*":
+            return None
+
+        try:
+            return int(header.removeprefix("W/").strip('"'))
+        except ValueError:
+            raise PreconditionFailed()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+
+        if self.request.method in ("PUT", "PATCH"):
+            context["expected_version"] = self.get_expected_version()
+
+        return context
+
+    def update(self, request, *args, **kwargs):
+        instance = self.get_object()
+        expected = self.get_expected_version()
+
+        if expected is not None and expected != instance.version:
+            raise PreconditionFailed()
+
+        serializer = self.get_serializer(
+            instance, data=request.data, partial=kwargs.pop("partial", False)
+        )
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+
+        return Response(
+            serializer.data, headers={"ETag": f'"{instance.version}"'}
+        )
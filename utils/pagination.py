@@ -0,0 +1,164 @@
+import json
+from collections import OrderedDict
+from functools import partial
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework import pagination
+from rest_framework.response import Response
+
+
+def estimate_count(queryset):
+    """Row estimate from the Postgres planner, or `None` when the
+    backend can not provide one.
+    """
+    connection = connections[queryset.db]
+
+    if connection.vendor != "postgresql":
+        return None
+
+    sql, params = queryset.order_by().query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class ExactCountPaginator(DjangoPaginator):
+    count_type = "exact"
+
+
+class EstimatedCountPaginator(ExactCountPaginator):
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, "query"):
+            return super().count
+
+        estimate = estimate_count(self.object_list)
+
+        if estimate is None or estimate < settings.PAGINATION_EXACT_COUNT_MAX:
+            return super().count
+
+        self.count_type = "estimate"
+
+        return estimate
+
+
+class CachedCountPaginator(ExactCountPaginator):
+    def __init__(self, object_list, per_page, counter=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.counter = counter
+
+    @cached_property
+    def count(self):
+        if self.counter is None:
+            return super().count
+
+        self.count_type = "cached"
+
+        return self.counter.get(self.object_list.count)
+
+
+class UncountedPage(Page):
+    def has_next(self):
+        return self.paginator.has_more
+
+
+class UncountedPaginator(DjangoPaginator):
+    count = None
+    count_type = "none"
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+
+        if not rows and number > 1:
+            raise EmptyPage("That page contains no results")
+
+        self.has_more = len(rows) > self.per_page
+        self.num_pages = number + self.has_more
+
+        return UncountedPage(rows[: self.per_page], number, self)
+
+
+class PageNumberPagination(pagination.PageNumberPagination):
+    """Page number pagination tunable per view through the `page_size`,
+    `max_page_size` and `count_mode` attributes.
+
+    `count_mode` is "exact", "estimate" (planner estimate for large
+    results), "cached" (a `CachedCounter` returned by the view's
+    `get_counter()`) or "none", which skips the count and reports `null`.
+    The strategy actually used is reported as `count_type`.
+    """
+
+    page_size_query_param = "page_size"
+
+    paginator_classes = {
+        "exact": ExactCountPaginator,
+        "estimate": EstimatedCountPaginator,
+        "cached": CachedCountPaginator,
+        "none": UncountedPaginator,
+    }
+
+    def paginate_queryset(self, queryset, request, view=None):
+        count_mode = getattr(view, "count_mode", "exact")
+
+        self.page_size = getattr(view, "page_size", self.page_size)
+        self.max_page_size = getattr(
+            view, "max_page_size", settings.PAGINATION_MAX_PAGE_SIZE
+        )
+        self.django_paginator_class = self.paginator_classes[count_mode]
+
+        if count_mode == "cached":
+            self.django_paginator_class = partial(
+                self.django_paginator_class, counter=view.get_counter()
+            )
+
+        if count_mode == "none":
+            self.last_page_strings = ()
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("count", self.page.paginator.count),
+                    ("count_type", self.page.paginator.count_type),
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count"]["nullable"] = True
+        response_schema["properties"]["count_type"] = {
+            "type": "string",
+            "enum": list(self.paginator_classes),
+            "example": "exact",
+        }
+
+        return response_schema
@@ -0,0 +1,132 @@
+import datetime
+import decimal
+import uuid
+from functools import lru_cache, partial
+
+import msgpack
+from rest_framework import serializers
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+DECIMAL_EXT = 1
+UUID_EXT = 2
+
+
+def encode_ext(value):
+    if isinstance(value, decimal.Decimal):
+        return msgpack.ExtType(DECIMAL_EXT, str(value).encode())
+
+    if isinstance(value, uuid.UUID):
+        return msgpack.ExtType(UUID_EXT, value.bytes)
+
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+
+    raise TypeError(f"Cannot serialize {type(value).__name__} to msgpack")
+
+
+def decode_ext(code: int, data: bytes):
+    if code == DECIMAL_EXT:
+        return decimal.Decimal(data.decode())
+
+    if code == UUID_EXT:
+        return uuid.UUID(bytes=data)
+
+    return msgpack.ExtType(code, data)
+
+
+def pack_decimal(value):
+    return msgpack.ExtType(DECIMAL_EXT, str(value).encode())
+
+
+def pack_uuid(value):
+    return msgpack.ExtType(
+        UUID_EXT, bytes.fromhex(str(value).replace("-", ""))
+    )
+
+
+def pack_many(pack, values):
+    return [pack(value) for value in values]
+
+
+@lru_cache(maxsize=None)
+def item_packer(serializer_class):
+    """
+    DRF fields render decimals and UUIDs as strings; builds a function that
+    turns those strings of one `serializer_class` item straight into the
+    extension types `decode_ext` reads, without going through `Decimal` or
+    `UUID` objects. Only the typed fields of each item are visited.
+    """
+    packers = []
+
+    for name, field in serializer_class().fields.items():
+        many = isinstance(field, serializers.ListSerializer)
+
+        if many:
+            field = field.child
+
+        nested = getattr(field, "serializer_class", None)
+
+        if isinstance(field, serializers.Serializer):
+            pack = item_packer(type(field))
+        elif nested is not None:
+            pack = item_packer(nested)
+        elif isinstance(field, serializers.DecimalField):
+            pack = pack_decimal
+        elif isinstance(field, serializers.UUIDField):
+            pack = pack_uuid
+        else:
+            continue
+
+        packers.append((name, partial(pack_many, pack) if many else pack))
+
+    def pack_item(item):
+        item = dict(item)
+
+        for name, pack in packers:
+            value = item.get(name)
+
+            if value is not None:
+                item[name] = pack(value)
+
+        return item
+
+    return pack_item
+
+
+def pack_types(value):
+    if isinstance(value, (ReturnDict, ReturnList)):
+        serializer = value.serializer
+
+        if isinstance(serializer, serializers.ListSerializer):
+            return pack_many(item_packer(type(serializer.child)), value)
+
+        return item_packer(type(serializer))(value)
+
+    if isinstance(value, dict):
+        return {key: pack_types(item) for key, item in value.items()}
+
+    if isinstance(value, list):
+        return [pack_types(item) for item in value]
+
+    return value
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        response = (renderer_context or {}).get("response")
+
+        # Validation errors come as serializer output too, but hold messages
+        # where the fields' values would be
+        if response is None or not response.exception:
+            data = pack_types(data)
+
+        return msgpack.packb(data, default=encode_ext, use_bin_type=True)
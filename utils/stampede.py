@@ -0,0 +1,134 @@
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+_guard = threading.Lock()
+_flights = {}
+
+
+def lock_cache_key(key: str) -> str:
+    return f"lock:{key}"
+
+
+@contextmanager
+def _flight(key: str):
+    with _guard:
+        flight = _flights.setdefault(key, [threading.Lock(), 0])
+        flight[1] += 1
+
+    try:
+        with flight[0]:
+            yield
+    finally:
+        with _guard:
+            flight[1] -= 1
+
+            if not flight[1]:
+                del _flights[key]
+
+
+def coalesce(key: str, lookup, compute):
+    """Runs `compute` for `key` in one thread of one worker at a time.
+
+    Threads of the same process queue on a local lock and workers race for
+    a lock entry in the shared cache; whoever loses waits for `lookup` to
+    return the winner's result instead of computing it again. A waiter
+    computes anyway once `CACHE_LOCK_TIMEOUT` passes, so a crashed worker
+    only delays the others.
+    """
+
+    with _flight(key):
+        value = lookup()
+
+        if value is not None:
+            return value
+
+        lock_key = lock_cache_key(key)
+        deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+
+        while not cache.add(lock_key, True, settings.CACHE_LOCK_TIMEOUT):
+            if time.monotonic() >= deadline:
+                return compute()
+
+            time.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+            value = lookup()
+
+            if value is not None:
+                return value
+
+        try:
+            value = lookup()
+
+            return compute() if value is None else value
+        finally:
+            cache.delete(lock_key)
+
+
+def wrap(value, timeout: int, delta: float = 0.0) -> tuple:
+    return value, time.time() + timeout, delta
+
+
+def unwrap(entry, stale: bool = False):
+    if entry is None:
+        return None
+
+    value, expires_at, _ = entry
+
+    if not stale and expires_at <= time.time():
+        return None
+
+    return value
+
+
+def refresh_due(entry, beta: float = 1.0) -> bool:
+    _, expires_at, delta = entry
+    jitter = -math.log(1.0 - random.random())
+
+    return time.time() + delta * beta * jitter >= expires_at
+
+
+def get_or_compute(key: str, compute, timeout: int, beta: float = 1.0):
+    """Cached `compute()` for `timeout` seconds, protected from stampedes.
+
+    Entries remember when they go stale and how long they took to compute.
+    Each read refreshes early with a probability that grows as expiry
+    nears and with the computation's cost (XFetch), so a hot key is
+    usually recomputed by one request before it expires. A stale entry
+    stays readable for `CACHE_STALE_TTL` more seconds: one request
+    recomputes it while the others keep serving the old value, and misses
+    are coalesced. `compute` must not return None.
+    """
+
+    entry = cache.get(key)
+
+    def store():
+        started = time.perf_counter()
+        value = compute()
+        cache.set(
+            key,
+            wrap(value, timeout, time.perf_counter() - started),
+            timeout + settings.CACHE_STALE_TTL,
+        )
+
+        return value
+
+    if entry is None:
+        return coalesce(key, lambda: unwrap(cache.get(key)), store)
+
+    if not refresh_due(entry, beta):
+        return unwrap(entry, stale=True)
+
+    lock_key = lock_cache_key(key)
+
+    if not cache.add(lock_key, True, settings.CACHE_LOCK_TIMEOUT):
+        return unwrap(entry, stale=True)
+
+    try:
+        return store()
+    finally:
+        cache.delete(lock_key)
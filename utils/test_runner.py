@@ -0,0 +1,30 @@
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """Points the cache at a file of the run's own, so the `cache.clear()`
+    calls of the tests never wipe a development server's cache and runs
+    started side by side don't share entries.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+
+        self.cache_directory = tempfile.TemporaryDirectory()
+        cache = {
+            **settings.CACHES["default"],
+            "LOCATION": Path(self.cache_directory.name) / "cache.sqlite3",
+        }
+        self.cache_settings = override_settings(CACHES={"default": cache})
+        self.cache_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.cache_settings.disable()
+        self.cache_directory.cleanup()
+
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,82 @@
+import gzip
+import tempfile
+import unittest
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+
+class StaticSchemaViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.SCHEMA_URL = "/schema/"
+
+    def test_schema_is_served_from_file(self):
+        """
+        Verifica se o schema pré-gerado é servido com ETag
+        """
+        response = self.client.get(self.SCHEMA_URL)
+
+        self.assertEqual(response.status_code, 200)
+
+        self.assertTrue(response.content.startswith(b"openapi:"))
+
+        self.assertIn("ETag", response)
+
+    def test_schema_not_modified(self):
+        """
+        Verifica se o schema retorna 304 quando o ETag confere
+        """
+        etag = self.client.get(self.SCHEMA_URL)["ETag"]
+
+        response = self.client.get(self.SCHEMA_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_schema_is_compressed_when_accepted(self):
+        """
+        Verifica se a resposta é comprimida com gzip quando aceito pelo
+        cliente e o ETag continua válido
+        """
+        response = self.client.get(
+            self.SCHEMA_URL, HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+        self.assertTrue(
+            gzip.decompress(response.content).startswith(b"openapi:")
+        )
+
+        cached = self.client.get(
+            self.SCHEMA_URL,
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+
+        self.assertEqual(cached.status_code, 304)
+
+    # The committed file is generated against Postgres, whose integer
+    # ranges show up as bounds in the schema
+    @unittest.skipUnless(
+        connection.vendor == "postgresql", "schema.yml targets Postgres"
+    )
+    def test_schema_file_is_up_to_date(self):
+        """
+        Verifica se o schema versionado é igual ao gerado pelo
+        `spectacular`, falhando quando a API muda sem regerá-lo
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "schema.yml"
+            call_command("spectacular", "--file", path, stderr=StringIO())
+
+            self.assertEqual(
+                path.read_text(),
+                settings.SCHEMA_FILE.read_text(),
+                "schema.yml is stale, regenerate it with "
+                "`python manage.py spectacular --file schema.yml`",
+            )
@@ -0,0 +1,397 @@
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+import zlib
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from utils.cache import SQLiteCache
+from utils.compression import compress_stream, negotiate_encoding
+from utils.counters import CachedCounter
+from utils.management.commands.profile_startup import STARTUP_SCRIPT
+from utils.pagination import PageNumberPagination
+from utils.stampede import get_or_compute, lock_cache_key, wrap
+from utils.throttling import SlidingWindowThrottle, TokenBucketThrottle
+from utils.uuids import new_uuid, uuid7
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ThrottleTests(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+        self.clock = FakeClock(1000.0)
+        self.request = mock.Mock(
+            method="POST", META={"REMOTE_ADDR": "1.2.3.4"}
+        )
+
+    def build(self, base, rate):
+        throttle_class = type(
+            "TestThrottle",
+            (base,),
+            {
+                "rate": rate,
+                "timer": self.clock,
+                "get_cache_key": lambda self, request, view: "test",
+            },
+        )
+        return throttle_class()
+
+    def test_sliding_window_limits_requests(self):
+        """
+        Verifica se a janela deslizante bloqueia após o limite
+        """
+        throttle = self.build(SlidingWindowThrottle, "3/min")
+
+        allowed = [
+            throttle.allow_request(self.request, None) for _ in range(4)
+        ]
+
+        self.assertEqual(allowed, [True, True, True, False])
+
+        self.assertGreater(throttle.wait(), 0)
+
+    def test_sliding_window_weighs_previous_window(self):
+        """
+        Verifica se a janela anterior é ponderada pela sobreposição
+        """
+        throttle = self.build(SlidingWindowThrottle, "4/min")
+
+        self.clock.now = 1020.0
+        for _ in range(4):
+            throttle.allow_request(self.request, None)
+
+        self.clock.now = 1110.0
+
+        self.assertTrue(throttle.allow_request(self.request, None))
+        self.assertTrue(throttle.allow_request(self.request, None))
+        self.assertFalse(throttle.allow_request(self.request, None))
+
+    def test_token_bucket_refills_over_time(self):
+        """
+        Verifica se o balde de tokens é reabastecido com o tempo
+        """
+        throttle = self.build(TokenBucketThrottle, "2/min")
+
+        self.assertTrue(throttle.allow_request(self.request, None))
+        self.assertTrue(throttle.allow_request(self.request, None))
+        self.assertFalse(throttle.allow_request(self.request, None))
+
+        self.assertEqual(throttle.wait(), 30)
+
+        self.clock.now += 30
+
+        self.assertTrue(throttle.allow_request(self.request, None))
+
+
+class CompressionTests(SimpleTestCase):
+    def test_negotiates_preferred_accepted_encoding(self):
+        """
+        Verifica a negociação de encoding respeitando valores q
+        """
+        self.assertEqual(negotiate_encoding("gzip"), "gzip")
+
+        self.assertEqual(negotiate_encoding("gzip;q=0, identity"), None)
+
+        self.assertEqual(negotiate_encoding("br;q=0, gzip;q=0.5"), "gzip")
+
+        self.assertIsNone(negotiate_encoding(""))
+
+    def test_streamed_chunks_are_flushed(self):
+        """
+        Verifica se cada chunk comprimido é decodificável isoladamente,
+        permitindo streaming
+        """
+        chunks = compress_stream("gzip", [b"data: 1\n\n", b"data: 2\n\n"])
+        decompressor = zlib.decompressobj(31)
+
+        self.assertEqual(
+            decompressor.decompress(next(chunks)), b"data: 1\n\n"
+        )
+
+        self.assertEqual(
+            b"".join(decompressor.decompress(chunk) for chunk in chunks),
+            b"data: 2\n\n",
+        )
+
+
+class PaginationTests(SimpleTestCase):
+    def paginate(self, url, **view_attributes):
+        request = Request(APIRequestFactory().get(url))
+        paginator = PageNumberPagination()
+        view = mock.Mock(spec=list(view_attributes), **view_attributes)
+
+        return paginator, paginator.paginate_queryset(
+            list(range(5)), request, view
+        )
+
+    def test_view_page_size_applies(self):
+        """
+        Verifica se o `page_size` definido na view é respeitado
+        """
+        _, page = self.paginate("/", page_size=4)
+
+        self.assertEqual(page, [0, 1, 2, 3])
+
+    def test_uncounted_pages_detect_next_page(self):
+        """
+        Verifica se páginas sem contagem ainda detectam se há uma próxima
+        página
+        """
+        paginator, page = self.paginate("/?page=2", count_mode="none")
+        response = paginator.get_paginated_response(page)
+
+        self.assertEqual(page, [2, 3])
+
+        self.assertIsNone(response.data["count"])
+
+        self.assertIn("page=3", response.data["next"])
+
+        paginator, page = self.paginate("/?page=3", count_mode="none")
+        response = paginator.get_paginated_response(page)
+
+        self.assertEqual(page, [4])
+
+        self.assertIsNone(response.data["next"])
+
+
+class CachedCounterTests(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+        self.counter = CachedCounter("things")
+        self.compute = mock.Mock(return_value=10)
+
+    def test_counter_is_computed_once_and_adjusted(self):
+        """
+        Verifica se o contador é calculado uma única vez e depois apenas
+        ajustado, ignorando ajustes feitos antes do primeiro cálculo
+        """
+        self.counter.incr()
+
+        self.assertEqual(self.counter.get(self.compute), 10)
+
+        self.counter.incr(3)
+        self.counter.decr()
+
+        self.assertEqual(self.counter.get(self.compute), 12)
+
+        self.compute.assert_called_once()
+
+    def test_reset_counter_is_recomputed(self):
+        """
+        Verifica se um contador descartado é recalculado na próxima leitura
+        """
+        self.counter.get(self.compute)
+        self.counter.reset()
+
+        self.assertEqual(self.counter.get(self.compute), 10)
+
+        self.assertEqual(self.compute.call_count, 2)
+
+
+class SQLiteCacheTests(SimpleTestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        self.clock = FakeClock(1000.0)
+        self.location = Path(directory.name) / "cache.sqlite3"
+        self.cache = self.build()
+
+        patcher = mock.patch("utils.cache.time.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def build(self, **options) -> SQLiteCache:
+        return SQLiteCache(self.location, {"OPTIONS": options})
+
+    def test_values_are_shared_between_instances(self):
+        """
+        Verifica se outra instância lê os valores gravados
+        """
+        self.cache.set("product", {"price": "99.75"})
+
+        self.assertEqual(self.build().get("product"), {"price": "99.75"})
+
+    def test_entries_expire(self):
+        """
+        Verifica se entradas expiradas somem e podem ser readicionadas
+        """
+        self.cache.set("product", 1, timeout=10)
+        self.clock.now += 11
+
+        self.assertIsNone(self.cache.get("product"))
+
+        self.assertTrue(self.cache.add("product", 2))
+
+        self.assertFalse(self.cache.add("product", 3))
+
+        self.assertEqual(self.cache.get("product"), 2)
+
+    def test_increments_are_atomic_updates(self):
+        """
+        Verifica se incrementos atualizam o inteiro guardado no banco
+        """
+        self.cache.set("count", 1)
+
+        self.assertEqual(self.cache.incr("count", 2), 3)
+
+        self.assertEqual(self.build().decr("count"), 2)
+
+        with self.assertRaises(ValueError):
+            self.cache.incr("missing")
+
+    def test_least_recently_used_entries_are_culled(self):
+        """
+        Verifica se as entradas menos usadas são removidas primeiro
+        """
+        cache = self.build(MAX_ENTRIES=2, CULL_EVERY=1)
+        cache.set("a", 1)
+        self.clock.now += 2
+        cache.set("b", 2)
+        self.clock.now += 2
+        cache.get("a")
+        self.clock.now += 2
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get_many(["a", "b", "c"]), {"a": 1, "c": 3})
+
+    def test_pinned_entries_are_not_culled(self):
+        """
+        Verifica se chaves com prefixo fixado só somem ao expirar
+        """
+        cache = self.build(
+            MAX_ENTRIES=1, CULL_EVERY=1, PINNED_PREFIXES=["lock:"]
+        )
+        cache.set("lock:a", 1, timeout=10)
+        self.clock.now += 2
+        cache.set("b", 2)
+        self.clock.now += 2
+        cache.set("c", 3)
+
+        self.assertEqual(
+            cache.get_many(["lock:a", "b", "c"]), {"lock:a": 1, "c": 3}
+        )
+
+        self.clock.now += 10
+        cache.set("d", 4)
+
+        self.assertFalse(cache.has_key("lock:a"))
+
+    def test_forked_workers_reconnect(self):
+        """
+        Verifica se processos filhos abrem a própria conexão
+        """
+        connection = self.cache.connection
+
+        with mock.patch("utils.cache.os.getpid", return_value=-1):
+            self.assertIsNot(self.cache.connection, connection)
+
+
+class TestRunnerTests(SimpleTestCase):
+    def test_tests_use_a_temporary_cache(self):
+        """
+        Verifica se os testes usam um arquivo de cache temporário em vez do
+        cache do projeto
+        """
+        location = Path(settings.CACHES["default"]["LOCATION"])
+
+        self.assertTrue(
+            location.is_relative_to(tempfile.gettempdir()), location
+        )
+
+
+class StampedeTests(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+        self.calls = []
+
+    def compute(self):
+        self.calls.append(1)
+
+        return len(self.calls)
+
+    def test_fresh_entries_are_not_recomputed(self):
+        """
+        Verifica se entradas válidas não são recalculadas
+        """
+        with mock.patch("utils.stampede.random.random", return_value=0.0):
+            self.assertEqual(get_or_compute("key", self.compute, 60), 1)
+
+            self.assertEqual(get_or_compute("key", self.compute, 60), 1)
+
+        self.assertEqual(len(self.calls), 1)
+
+    def test_entries_near_expiry_are_refreshed_early(self):
+        """
+        Verifica se entradas perto de expirar são recalculadas antes
+        """
+        cache.set("key", wrap("old", 1, delta=1.0), 60)
+
+        with mock.patch("utils.stampede.random.random", return_value=0.9):
+            self.assertEqual(get_or_compute("key", self.compute, 60), 1)
+
+    def test_stale_entry_is_served_while_refreshing(self):
+        """
+        Verifica se a entrada vencida é servida durante o recálculo
+        """
+        cache.set("key", wrap("old", -1), 60)
+        cache.add(lock_cache_key("key"), True)
+
+        self.assertEqual(get_or_compute("key", self.compute, 60), "old")
+
+        self.assertEqual(self.calls, [])
+
+
+class UUIDTests(SimpleTestCase):
+    def test_uuid7_is_time_ordered(self):
+        with mock.patch("time.time_ns", side_effect=[10**15, 2 * 10**15]):
+            first, second = uuid7(), uuid7()
+
+        self.assertEqual(first.version, 7)
+
+        self.assertEqual(first.variant, uuid.RFC_4122)
+
+        self.assertLess(first, second)
+
+    @override_settings(ORDERED_UUIDS=False)
+    def test_random_uuids_can_be_kept(self):
+        self.assertEqual(new_uuid().version, 4)
+
+
+class StartupTests(SimpleTestCase):
+    def test_docs_disabled_skips_drf_spectacular(self):
+        """
+        Verifica se, com a documentação desligada, um worker sobe sem
+        importar o drf-spectacular
+        """
+        script = STARTUP_SCRIPT.format(urlconf=settings.ROOT_URLCONF) + (
+            "; import sys; "
+            "print(any(name.startswith('drf_spectacular') "
+            "for name in sys.modules))"
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "API_DOCS_ENABLED": "False"},
+        )
+
+        self.assertEqual(result.stdout.strip(), "False", result.stderr)
@@ -0,0 +1,138 @@
+import math
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class MethodScopedThrottle(SimpleRateThrottle):
+    methods = None
+
+    def allow_request(self, request, view) -> bool:
+        if self.methods is not None and request.method not in self.methods:
+            return True
+
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+
+        return self.consume()
+
+    def consume(self) -> bool:
+        raise NotImplementedError(".consume() must be overridden")
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class SlidingWindowThrottle(MethodScopedThrottle):
+    """
+    Weighs the previous fixed window by how much of it still overlaps the
+    sliding one. Each request is counted with one atomic `incr` before it
+    is judged, so concurrent workers can never admit more than the limit;
+    rejected requests give their count back.
+    """
+
+    def consume(self) -> bool:
+        window = int(self.now // self.duration)
+        current_key = f"{self.key}:{window}"
+        previous_key = f"{self.key}:{window - 1}"
+
+        self.cache.add(current_key, 0, self.duration * 2)
+
+        try:
+            current = self.cache.incr(current_key)
+        except ValueError:
+            self.cache.set(current_key, 1, self.duration * 2)
+            current = 1
+
+        previous = self.cache.get(previous_key, 0)
+        elapsed = self.now - window * self.duration
+        overlap = 1 - elapsed / self.duration
+
+        if previous * overlap + current <= self.num_requests:
+            return True
+
+        self.cache.decr(current_key)
+        current -= 1
+
+        if previous and current < self.num_requests:
+            remaining = 1 - (self.num_requests - current) / previous
+            self.wait_seconds = remaining * self.duration - elapsed
+        else:
+            self.wait_seconds = self.duration - elapsed
+
+        return False
+
+
+class TokenBucketThrottle(MethodScopedThrottle):
+    """
+    Allows bursts of up to `num_requests`, refilled at
+    `num_requests / duration` tokens per second.
+
+    The bucket is kept as its theoretical arrival time in milliseconds
+    (GCRA), so taking a token is one atomic `incr` and concurrent workers
+    can not both spend the last one. An idle bucket is caught up to the
+    present with a second `incr`, which a race can only make stricter.
+    """
+
+    def consume(self) -> bool:
+        interval = math.ceil(self.duration * 1000 / self.num_requests)
+        burst = self.duration * 1000
+        now = int(self.now * 1000)
+
+        self.cache.add(self.key, now, self.duration * 2)
+
+        try:
+            arrival = self.cache.incr(self.key, interval)
+        except ValueError:
+            self.cache.set(self.key, now + interval, self.duration * 2)
+            return True
+
+        if arrival - interval < now:
+            arrival = self.cache.incr(self.key, now - arrival + interval)
+
+        if arrival - now > burst:
+            self.cache.decr(self.key, interval)
+            self.wait_seconds = math.ceil((arrival - now - burst) / 1000)
+            return False
+
+        self.cache.touch(self.key, self.duration * 2)
+
+        return True
+
+
+class IPKeyMixin:
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class TokenKeyMixin:
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class LoginRateThrottle(IPKeyMixin, TokenBucketThrottle):
+    scope = "login"
+
+
+class AccountCreationRateThrottle(IPKeyMixin, SlidingWindowThrottle):
+    scope = "account_creation"
+    methods = ("POST",)
+
+
+class WriteRateThrottle(TokenKeyMixin, SlidingWindowThrottle):
+    scope = "writes"
+    methods = ("POST", "PUT", "PATCH", "DELETE")
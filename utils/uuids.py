@@ -0,0 +1,28 @@
+import os
+import time
+import uuid
+
+from django.conf import settings
+
+
+def uuid7() -> uuid.UUID:
+    """Time-ordered UUID (version 7): 48 bits of Unix milliseconds followed
+    by random bits, so consecutive ids land next to each other in a B-tree.
+    """
+    timestamp = time.time_ns() // 1_000_000
+    random = int.from_bytes(os.urandom(10), "big")
+
+    value = timestamp << 80
+    value |= 0x7 << 76
+    value |= (random >> 68) << 64
+    value |= 0b10 << 62
+    value |= random & (1 << 62) - 1
+
+    return uuid.UUID(int=value)
+
+
+def new_uuid() -> uuid.UUID:
+    if settings.ORDERED_UUIDS:
+        return uuid7()
+
+    return uuid.uuid4()
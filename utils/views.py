@@ -0,0 +1,49 @@
+import hashlib
+from functools import lru_cache
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.utils.module_loading import import_string
+from django.views import View
+
+
+@lru_cache(maxsize=None)
+def load_schema() -> tuple:
+    try:
+        content = settings.SCHEMA_FILE.read_bytes()
+    except FileNotFoundError:
+        raise Http404("Schema has not been generated.")
+
+    return content, f'"{hashlib.md5(content).hexdigest()}"'
+
+
+class StaticSchemaView(View):
+    content_type = "application/vnd.oai.openapi; charset=utf-8"
+
+    def get(self, request, *args, **kwargs):
+        content, etag = load_schema()
+
+        if_none_match = request.headers.get("If-None-Match", "")
+
+        if if_none_match.removeprefix("W/") == etag:
+            return HttpResponseNotModified()
+
+        response = HttpResponse(content, content_type=self.content_type)
+        response["ETag"] = etag
+        response["Cache-Control"] = "public, max-age=3600"
+
+        return response
+
+
+def lazy_view(dotted_path: str, **initkwargs):
+    view = None
+
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+
+        if view is None:
+            view = import_string(dotted_path).as_view(**initkwargs)
+
+        return view(request, *args, **kwargs)
+
+    return wrapper